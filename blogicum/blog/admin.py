@@ -1,9 +1,10 @@
 from django.contrib import admin
 
-from .models import Post, Category, Location, Comment
+from .models import Post, Category, Location, Comment, Job
 
 
 admin.site.register(Post)
 admin.site.register(Category)
 admin.site.register(Location)
 admin.site.register(Comment)
+admin.site.register(Job)
@@ -0,0 +1,241 @@
+"""JSON API только для чтения: ленты постов и комментарии.
+
+Строки выбираются через values() без создания объектов моделей,
+категории и места подставляются из справочников процесса. Набор полей
+задаётся параметром ?fields=id,title, страницы листаются курсором
+?cursor= как в HTML-лентах. С ?format=ndjson отдаётся вся выборка
+потоком по объекту JSON на строку — для массовой выгрузки.
+"""
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.http import urlencode
+from django.views import View
+
+from .cache import FEED_SCOPE, LOOKUPS_SCOPE, category_feed_scope
+from .lookups import get_lookups, get_published_category
+from .mixins import ConditionalGetMixin
+from .models import Comment
+from .paginators import CursorPaginator, InvalidCursor
+from .utils import get_posts
+
+
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+NDJSON_CHUNK_SIZE = 2000
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+User = get_user_model()
+
+
+class ApiError(Exception):
+    """Некорректные параметры запроса: ответ 400 с текстом ошибки."""
+
+
+def category_slug(category_id, lookups):
+    category = lookups.categories.get(category_id)
+    return category.slug if category is not None else None
+
+
+def location_name(location_id, lookups):
+    """Название места или None, как «Планета Земля» в шаблонах."""
+    location = lookups.locations.get(location_id)
+    if location is None or not location.is_published:
+        return None
+    return location.name
+
+
+def media_url(name, lookups):
+    return default_storage.url(name) if name else None
+
+
+# Поле ответа -> (поле для values(), преобразование значения или None).
+POST_FIELDS = {
+    'id': ('id', None),
+    'title': ('title', None),
+    'excerpt': ('excerpt', None),
+    'text': ('text', None),
+    'text_html': ('text_html', None),
+    'pub_date': ('pub_date', None),
+    'author': ('author__username', None),
+    'category': ('category_id', category_slug),
+    'location': ('location_id', location_name),
+    'image': ('image', media_url),
+    'comments_count': ('comments_count', None),
+}
+POST_DEFAULT_FIELDS = (
+    'id', 'title', 'excerpt', 'pub_date', 'author', 'category', 'location',
+    'image', 'comments_count',
+)
+COMMENT_FIELDS = {
+    'id': ('id', None),
+    'text': ('text', None),
+    'author': ('author__username', None),
+    'created_at': ('created_at', None),
+}
+
+
+class ValuesApiView(ConditionalGetMixin, View):
+    """Страница или поток строк get_queryset() в JSON.
+
+    Строки берутся из queryset или менеджера model, как в ListView.
+    Ошибки параметров и 404 тоже отдаются в JSON.
+    """
+
+    model = None
+    queryset = None
+    fields = POST_FIELDS
+    default_fields = POST_DEFAULT_FIELDS
+    ordering = ('-pub_date', '-id')
+
+    def get_queryset(self):
+        if self.queryset is not None:
+            return self.queryset.all()
+        if self.model is not None:
+            return self.model._default_manager.all()
+        raise ImproperlyConfigured(
+            f'{self.__class__.__name__} требует queryset, model '
+            f'или переопределения get_queryset().'
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except (ApiError, InvalidCursor) as error:
+            return self.error(error, 400)
+        except Http404 as error:
+            return self.error(error, 404)
+
+    @staticmethod
+    def error(error, status):
+        return JsonResponse(
+            {'error': str(error)},
+            status=status,
+            json_dumps_params={'ensure_ascii': False},
+        )
+
+    def get_fields(self):
+        requested = self.request.GET.get('fields')
+        if not requested:
+            return list(self.default_fields)
+        names = [
+            name.strip() for name in requested.split(',') if name.strip()
+        ]
+        unknown = [name for name in names if name not in self.fields]
+        if unknown or not names:
+            raise ApiError(f'Неизвестные поля: {", ".join(unknown)}')
+        return list(dict.fromkeys(names))
+
+    def get_page_size(self):
+        try:
+            size = int(self.request.GET.get('limit', API_PAGE_SIZE))
+        except ValueError:
+            raise ApiError('limit должен быть числом')
+        return min(max(size, 1), API_MAX_PAGE_SIZE)
+
+    def get(self, request, *args, **kwargs):
+        names = self.get_fields()
+        sources = {self.fields[name][0] for name in names}
+        sources |= {field.lstrip('-') for field in self.ordering}
+        rows = self.get_queryset().values(*sources)
+        if request.GET.get('format') == 'ndjson':
+            return StreamingHttpResponse(
+                self.stream(rows.order_by(*self.ordering), names),
+                content_type=NDJSON_CONTENT_TYPE,
+            )
+        paginator = CursorPaginator(
+            rows, self.get_page_size(), self.ordering
+        )
+        page = paginator.page(request.GET.get('cursor'))
+        lookups = get_lookups()
+        return JsonResponse(
+            {
+                'results': [
+                    self.serialize(row, names, lookups) for row in page
+                ],
+                'next': self.page_url(page.next_cursor),
+                'previous': self.page_url(page.previous_cursor),
+            },
+            json_dumps_params={'ensure_ascii': False},
+        )
+
+    def serialize(self, row, names, lookups):
+        result = {}
+        for name in names:
+            source, convert = self.fields[name]
+            value = row[source]
+            result[name] = value if convert is None else convert(
+                value, lookups
+            )
+        return result
+
+    def stream(self, rows, names):
+        lookups = get_lookups()
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        for row in rows.iterator(chunk_size=NDJSON_CHUNK_SIZE):
+            yield encoder.encode(self.serialize(row, names, lookups)) + '\n'
+
+    def page_url(self, cursor):
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query['cursor'] = cursor
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{urlencode(query, doseq=True)}'
+        )
+
+
+class PostsApiView(ValuesApiView):
+    """Лента как PostListView"""
+
+    def get_cache_scopes(self):
+        return (FEED_SCOPE, LOOKUPS_SCOPE)
+
+    def get_queryset(self):
+        return get_posts()
+
+
+class CategoryPostsApiView(PostsApiView):
+    """Посты категории как CategoryPostView"""
+
+    def get_cache_scopes(self):
+        return (
+            category_feed_scope(self.kwargs['category_slug']), LOOKUPS_SCOPE
+        )
+
+    def get_queryset(self):
+        category = get_published_category(self.kwargs['category_slug'])
+        if category is None:
+            raise Http404('Категория не найдена')
+        return get_posts().filter(category=category)
+
+
+class ProfilePostsApiView(PostsApiView):
+    """Посты автора, видимые в лентах"""
+
+    def get_queryset(self):
+        return get_posts().filter(author__username=self.kwargs['username'])
+
+    def get(self, request, *args, **kwargs):
+        get_object_or_404(User, username=self.kwargs['username'])
+        return super().get(request, *args, **kwargs)
+
+
+class CommentsApiView(ValuesApiView):
+    """Комментарии к посту из ленты, от старых к новым"""
+
+    model = Comment
+    fields = COMMENT_FIELDS
+    default_fields = tuple(COMMENT_FIELDS)
+    ordering = ('created_at', 'id')
+
+    def get_cache_scopes(self):
+        return (f'post:{self.kwargs["post_id"]}',)
+
+    def get_queryset(self):
+        if not get_posts().filter(pk=self.kwargs['post_id']).exists():
+            raise Http404('Пост не найден')
+        return super().get_queryset().filter(post_id=self.kwargs['post_id'])
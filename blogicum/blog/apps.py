@@ -1,7 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate, pre_migrate
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+        from .search import create_search_triggers, drop_search_triggers
+
+        pre_migrate.connect(drop_search_triggers, sender=self)
+        post_migrate.connect(create_search_triggers, sender=self)
@@ -0,0 +1,64 @@
+"""Асинхронные варианты лент, поста и профиля для ASGI.
+
+В Django 3.2 нет асинхронного ORM и кэша, поэтому:
+    * анонимный GET без cookie сессии ищет страницу в кэше страниц
+      через sync_to_async(thread_sensitive=False) — в пуле потоков,
+      не занимая поток ORM; 304 отдаётся по сохранённому ETag;
+    * остальные запросы выполняет синхронный view в потоке ORM через
+      sync_to_async, запросы к базе те же, что и под WSGI.
+Медленный клиент не держит ни поток ORM, ни воркер: чтение запроса и
+отправка ответа ждут в цикле событий.
+
+Варианты подключаются в blog/urls.py при BLOG_ASYNC_VIEWS, эту
+настройку включает blogicum/asgi.py.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+
+from . import views
+from .cache import get_cached_page, page_cache_key
+from .mixins import AnonymousPageCacheMixin
+
+
+def cached_page(request, view):
+    """Страница из кэша страниц или 304 по её ETag; None — промах."""
+    response = get_cached_page(
+        page_cache_key(request, view.get_cache_scopes())
+    )
+    if response is None:
+        return None
+    return get_conditional_response(
+        request, etag=response.get('ETag'), response=response
+    )
+
+
+def as_async_view(view_class, **initkwargs):
+    """Асинхронный view поверх синхронного view_class."""
+    view = sync_to_async(view_class.as_view(**initkwargs))
+    page_cached = issubclass(view_class, AnonymousPageCacheMixin)
+
+    async def async_view(request, *args, **kwargs):
+        if (
+            page_cached
+            and request.method == 'GET'
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        ):
+            instance = view_class(**initkwargs)
+            instance.setup(request, *args, **kwargs)
+            response = await sync_to_async(
+                cached_page, thread_sensitive=False
+            )(request, instance)
+            if response is not None:
+                return response
+        return await view(request, *args, **kwargs)
+
+    async_view.view_class = view_class
+    async_view.view_initkwargs = initkwargs
+    return async_view
+
+
+post_list = as_async_view(views.PostListView)
+category_posts = as_async_view(views.CategoryPostView)
+post_detail = as_async_view(views.PostDetailView)
+profile = as_async_view(views.ProfileDetailView)
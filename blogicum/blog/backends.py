@@ -0,0 +1,26 @@
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .cache import get_versions
+
+
+USER_CACHE_TIMEOUT = 60 * 60
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берёт пользователя сессии из кэша.
+
+    Ключ содержит версию области user:<pk>; её сдвигает сигнал
+    сохранения и удаления пользователя, так что смена пароля или
+    блокировка видны сразу.
+    """
+
+    def get_user(self, user_id):
+        scope = f'user:{user_id}'
+        key = f'blog:user:{user_id}:{get_versions(scope)[scope]}'
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, USER_CACHE_TIMEOUT)
+        return user
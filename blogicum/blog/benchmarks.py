@@ -0,0 +1,234 @@
+"""Временная база, данные и медленные клиенты для команд-бенчмарков.
+
+Бенчмарки работают не с рабочей базой, а с временной тестовой, и в
+тестовом окружении: setup_test_environment() разрешает хост
+testserver, с которым ходит django.test.Client, и подменяет почтовый
+бэкенд. Проверки корректности живут в tests/, здесь только замеры
+и клиенты, которыми пользуются и тесты.
+"""
+import asyncio
+import importlib
+import time
+from contextlib import contextmanager
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import (
+    setup_test_environment, teardown_test_environment
+)
+from django.urls import clear_url_caches, reverse
+from django.utils import timezone
+
+from .lookups import refresh_lookups
+from .models import Category, Comment, Location, Post
+from .publishing import publish_due_posts
+from .utils import rebuild_post_text
+
+
+User = get_user_model()
+
+HOST = '127.0.0.1'
+
+# Запросы ко всем URL блога: (имя URL, кто запрашивает, метод).
+BLOG_REQUESTS = (
+    ('blog:index', 'anonymous', 'get'),
+    ('blog:category_posts', 'anonymous', 'get'),
+    ('blog:post_detail', 'anonymous', 'get'),
+    ('blog:profile', 'anonymous', 'get'),
+    ('blog:search', 'anonymous', 'get'),
+    ('blog:api_posts', 'anonymous', 'get'),
+    ('blog:api_category_posts', 'anonymous', 'get'),
+    ('blog:api_profile_posts', 'anonymous', 'get'),
+    ('blog:api_post_comments', 'anonymous', 'get'),
+    ('blog:posts_rss', 'anonymous', 'get'),
+    ('blog:posts_atom', 'anonymous', 'get'),
+    ('blog:category_rss', 'anonymous', 'get'),
+    ('blog:category_atom', 'anonymous', 'get'),
+    ('blog:profile_rss', 'anonymous', 'get'),
+    ('blog:profile_atom', 'anonymous', 'get'),
+    ('blog:index', 'author', 'get'),
+    ('blog:post_detail', 'author', 'get'),
+    ('blog:profile', 'author', 'get'),
+    ('blog:create_post', 'author', 'get'),
+    ('blog:edit_post', 'author', 'get'),
+    ('blog:delete_post', 'author', 'get'),
+    ('blog:edit_profile', 'author', 'get'),
+    ('blog:add_comment', 'author', 'post'),
+    ('blog:edit_comment', 'author', 'get'),
+    ('blog:delete_comment', 'author', 'get'),
+    ('blog:delete_comment', 'author', 'post'),
+)
+
+
+@contextmanager
+def temporary_database():
+    """Тестовая база и тестовое окружение на время блока."""
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def seed():
+    """Автор, категория, 15 постов и 30 комментариев к последнему."""
+    author = User.objects.create_user('author', password='author')
+    category = Category.objects.create(
+        title='Категория', description='', slug='category'
+    )
+    location = Location.objects.create(name='Место')
+    Post.objects.bulk_create(
+        Post(
+            title=f'Пост {number}',
+            text='Текст поста',
+            pub_date=timezone.now() - timezone.timedelta(hours=number),
+            author=author,
+            category=category,
+            location=location,
+        )
+        for number in range(1, 16)
+    )
+    publish_due_posts()
+    rebuild_post_text()
+    post = Post.objects.latest('pub_date')
+    comments = Comment.objects.bulk_create(
+        Comment(post=post, author=author, text=f'Комментарий {number}')
+        for number in range(30)
+    )
+    Post.objects.filter(pk=post.pk).update(comments_count=len(comments))
+    return {
+        'author': author,
+        'post': post,
+        'comment': Comment.objects.filter(post=post).first(),
+    }
+
+
+def blog_requests(data):
+    """Запросы ко всем URL блога: (случай, URL, данные формы)."""
+    post, comment, author = data['post'], data['comment'], data['author']
+    comment_kwargs = {'post_id': post.pk, 'comment_id': comment.pk}
+    kwargs = {
+        'blog:index': {},
+        'blog:category_posts': {'category_slug': 'category'},
+        'blog:post_detail': {'post_id': post.pk},
+        'blog:profile': {'username': author.username},
+        'blog:search': {},
+        'blog:api_posts': {},
+        'blog:api_category_posts': {'category_slug': 'category'},
+        'blog:api_profile_posts': {'username': author.username},
+        'blog:api_post_comments': {'post_id': post.pk},
+        'blog:posts_rss': {},
+        'blog:posts_atom': {},
+        'blog:category_rss': {'category_slug': 'category'},
+        'blog:category_atom': {'category_slug': 'category'},
+        'blog:profile_rss': {'username': author.username},
+        'blog:profile_atom': {'username': author.username},
+        'blog:create_post': {},
+        'blog:edit_post': {'post_id': post.pk},
+        'blog:delete_post': {'post_id': post.pk},
+        'blog:edit_profile': {'pk': author.pk},
+        'blog:add_comment': {'post_id': post.pk},
+        'blog:edit_comment': comment_kwargs,
+        'blog:delete_comment': comment_kwargs,
+    }
+    for case in BLOG_REQUESTS:
+        name, who, method = case
+        payload = {'q': 'пост'} if name == 'blog:search' else {}
+        if method == 'post':
+            payload = {'text': 'Новый комментарий'}
+        yield case, reverse(name, kwargs=kwargs[name]), payload
+
+
+def blog_clients(data):
+    clients = {'anonymous': Client(), 'author': Client()}
+    clients['author'].force_login(data['author'])
+    return clients
+
+
+def clear_caches():
+    """Очищает кэш данных и страниц; сессии остаются в своём кэше.
+
+    Снимок справочников строится заново так же, как его строят сигналы
+    после изменения категорий и мест, а не при первом запросе.
+    """
+    caches['default'].clear()
+    caches[settings.BLOG_PAGE_CACHE_ALIAS].clear()
+    refresh_lookups()
+
+
+def reload_urls():
+    importlib.reload(importlib.import_module('blog.urls'))
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+@contextmanager
+def async_views():
+    """Пересобирает URLconf с асинхронными view, как в blogicum/asgi.py."""
+    try:
+        with override_settings(BLOG_ASYNC_VIEWS=True):
+            reload_urls()
+            yield
+    finally:
+        reload_urls()
+
+
+def wsgi_client(application, path, delay):
+    """Медленный клиент: запрос и чтение ответа занимают по delay секунд.
+
+    Синхронный воркер всё это время занят одним клиентом.
+    """
+    environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET'}
+    setup_testing_defaults(environ)
+    status = []
+    time.sleep(delay)
+    result = application(
+        environ, lambda line, headers, exc_info=None: status.append(line)
+    )
+    try:
+        body = b''.join(result)
+    finally:
+        result.close()
+    time.sleep(delay)
+    return int(status[0].split()[0]), body
+
+
+async def asgi_client(application, path, delay):
+    """Тот же медленный клиент для приложения ASGI."""
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', HOST.encode())],
+        'client': (HOST, 50000),
+        'server': (HOST, 80),
+    }
+    response = {'body': b''}
+
+    async def receive():
+        await asyncio.sleep(delay)
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        else:
+            response['body'] += message.get('body', b'')
+            if not message.get('more_body'):
+                await asyncio.sleep(delay)
+
+    await application(scope, receive, send)
+    return response['status'], response['body']
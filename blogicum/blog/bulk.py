@@ -0,0 +1,338 @@
+"""Потоковые загрузка и выгрузка фикстур в формате loaddata/dumpdata.
+
+Файл читается кусками и разбирается по одному объекту, поэтому
+память не зависит от размера фикстуры. Объекты копятся пачками по
+моделям и пишутся многострочными INSERT без сигналов и лишних
+запросов.
+"""
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.core.management.color import no_style
+from django.core.serializers import base, python, serialize
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.db.models.signals import post_save, pre_save
+
+
+CHUNK_SIZE = 1 << 16
+BATCH_SIZE = 1000
+WHITESPACE = ' \t\r\n'
+
+
+class FixtureReader:
+    """Читает поток кусками и разбирает JSON-значения по одному."""
+
+    def __init__(self, stream, chunk_size=CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer, self.position, self.eof = '', 0, False
+
+    def read_more(self):
+        chunk = '' if self.eof else self.stream.read(self.chunk_size)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return bool(chunk)
+
+    def peek(self):
+        """Следующий непробельный символ."""
+        while True:
+            while (
+                self.position < len(self.buffer)
+                and self.buffer[self.position] in WHITESPACE
+            ):
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read_more():
+                raise base.DeserializationError('Фикстура оборвалась')
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise base.DeserializationError(
+                f'Ожидался {char!r}, найдено {found!r}'
+            )
+        self.position += 1
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                obj, self.position = self.decoder.raw_decode(
+                    self.buffer, self.position
+                )
+                return obj
+            except json.JSONDecodeError as error:
+                if not self.read_more():
+                    raise base.DeserializationError(error) from error
+
+
+def iter_fixture(stream, chunk_size=CHUNK_SIZE):
+    """Объекты JSON-массива из потока по одному."""
+    reader = FixtureReader(stream, chunk_size)
+    reader.expect('[')
+    if reader.peek() == ']':
+        return
+    while True:
+        yield reader.decode()
+        if reader.peek() == ']':
+            return
+        reader.expect(',')
+
+
+def dependency_order(models):
+    """Модели так, чтобы связанные по FK шли раньше ссылающихся."""
+    models = list(models)
+    ordered, visiting = [], set()
+
+    def visit(model):
+        if model in ordered or model in visiting:
+            return
+        visiting.add(model)
+        for field in model._meta.concrete_fields:
+            related = field.related_model
+            if field.is_relation and related in models and related != model:
+                visit(related)
+        visiting.discard(model)
+        ordered.append(model)
+
+    for model in models:
+        visit(model)
+    return ordered
+
+
+class BulkLoader:
+    """Пишет десериализованные объекты пачками по моделям.
+
+    Вызывать с отключённой проверкой FK: пачки
+    разных моделей уходят в базу по мере заполнения. Остаток
+    записывается в flush() в порядке зависимостей.
+
+    Как и в loaddata, объект с pk заменяет строку с тем же pk, а его
+    связи many-to-many — прежние связи: перед вставкой пачки старые
+    строки удаляются без каскада, ссылки проверяются в конце загрузки.
+    """
+
+    def __init__(self, using, batch_size=BATCH_SIZE, send_signals=False):
+        self.using = using
+        self.batch_size = batch_size
+        self.send_signals = send_signals
+        self.pending = defaultdict(list)
+        self.cleared = defaultdict(lambda: defaultdict(set))
+        self.loaded = defaultdict(int)
+
+    def load(self, objects):
+        for deserialized in python.Deserializer(
+            objects, using=self.using, ignorenonexistent=True
+        ):
+            self.add(deserialized.object)
+            for name, pks in deserialized.m2m_data.items():
+                self.add_m2m(deserialized.object, name, pks)
+        self.flush()
+
+    def add(self, obj):
+        model = type(obj)
+        self.pending[model].append(obj)
+        if len(self.pending[model]) >= self.batch_size:
+            self.write(model)
+
+    def add_m2m(self, obj, name, pks):
+        field = obj._meta.get_field(name)
+        through = field.remote_field.through
+        if not through._meta.auto_created:
+            return
+        if obj.pk is None:
+            if not pks:
+                return
+            raise base.DeserializationError(
+                f'{obj._meta.label}: для связей {name} нужен pk'
+            )
+        self.cleared[through][f'{field.m2m_field_name()}_id'].add(obj.pk)
+        for pk in pks:
+            self.add(through(**{
+                f'{field.m2m_field_name()}_id': obj.pk,
+                f'{field.m2m_reverse_field_name()}_id': pk,
+            }))
+
+    def flush(self):
+        for model in dependency_order([*self.pending, *self.cleared]):
+            self.write(model)
+
+    def write(self, model):
+        self.clear_m2m(model)
+        batch, self.pending[model] = self.pending[model], []
+        if not batch:
+            return
+        if self.send_signals:
+            for obj in batch:
+                pre_save.send(
+                    sender=model, instance=obj, raw=True, using=self.using,
+                    update_fields=None,
+                )
+        self.insert(model, batch)
+        if self.send_signals:
+            for obj in batch:
+                post_save.send(
+                    sender=model, instance=obj, created=True, raw=True,
+                    using=self.using, update_fields=None,
+                )
+        self.loaded[model] += len(batch)
+
+    def delete_rows(self, model, column, values):
+        """DELETE по значениям column без каскада и сигналов."""
+        queryset = model._base_manager.using(self.using)
+        values = list(values)
+        size = max(
+            connections[self.using].ops.bulk_batch_size([column], values), 1
+        )
+        for start in range(0, len(values), size):
+            queryset.filter(
+                **{f'{column}__in': values[start:start + size]}
+            )._raw_delete(self.using)
+
+    def clear_m2m(self, through):
+        """Удаляет прежние связи объектов, загруженных с pk."""
+        for column, pks in self.cleared.pop(through, {}).items():
+            self.delete_rows(through, column, pks)
+
+    def insert(self, model, batch):
+        """INSERT пачкой в режиме raw, как save_base(raw=True) в loaddata.
+
+        bulk_create() вызывает pre_save() полей и затёр бы created_at
+        (auto_now_add) текущим временем, а raw берёт значения из фикстуры.
+        """
+        queryset = model._base_manager.using(self.using)
+        ops = connections[self.using].ops
+        fields = model._meta.local_concrete_fields
+        with_pk = [obj for obj in batch if obj.pk is not None]
+        without_pk = [obj for obj in batch if obj.pk is None]
+        self.delete_rows(model, 'pk', [obj.pk for obj in with_pk])
+        for objs, insert_fields in (
+            (with_pk, fields),
+            (without_pk, [field for field in fields
+                          if field is not model._meta.pk]),
+        ):
+            size = max(ops.bulk_batch_size(insert_fields, objs), 1)
+            for start in range(0, len(objs), size):
+                queryset._insert(
+                    objs[start:start + size],
+                    fields=insert_fields,
+                    raw=True,
+                    using=self.using,
+                )
+        for obj in batch:
+            obj._state.adding = False
+            obj._state.db = self.using
+
+
+@contextmanager
+def deferred_indexes(models, using):
+    """Удаляет индексы и триггеры таблиц на время загрузки.
+
+    В SQLite пересоздаются все индексы и триггеры из sqlite_master,
+    в остальных базах — только индексы из Meta.indexes.
+    """
+    connection = connections[using]
+    if not models:
+        yield
+        return
+    if connection.vendor == 'sqlite':
+        tables = [model._meta.db_table for model in models]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT type, name, sql FROM sqlite_master "
+                "WHERE type IN ('index', 'trigger') AND sql IS NOT NULL "
+                f"AND tbl_name IN ({', '.join(['%s'] * len(tables))})",
+                tables,
+            )
+            objects = cursor.fetchall()
+            for kind, name, _ in objects:
+                cursor.execute(
+                    f'DROP {kind.upper()} {connection.ops.quote_name(name)}'
+                )
+        yield
+        with connection.cursor() as cursor:
+            for _, _, sql in objects:
+                cursor.execute(sql)
+        return
+    indexes = [(model, index) for model in models for index in
+               model._meta.indexes]
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.remove_index(model, index)
+    yield
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.add_index(model, index)
+
+
+def load_fixture(stream, using, defer_indexes=(), **options):
+    """Загружает фикстуру и возвращает {модель: строк} и время в секундах.
+
+    defer_indexes — модели, индексы которых снимаются на время загрузки.
+    """
+    connection = connections[using]
+    loader = BulkLoader(using, **options)
+    started = time.perf_counter()
+    # Проверки FK отключаются до начала транзакции: внутри неё SQLite
+    # не даёт выключить foreign_keys, и каждая вставка родителя искала бы
+    # ссылающиеся строки, а без индексов — перебором всей таблицы.
+    with connection.constraint_checks_disabled():
+        with transaction.atomic(using=using):
+            with deferred_indexes(defer_indexes, using):
+                loader.load(iter_fixture(stream))
+            tables = [model._meta.db_table for model in loader.loaded]
+            connection.check_constraints(table_names=tables)
+            reset = connection.ops.sequence_reset_sql(
+                no_style(), list(loader.loaded)
+            )
+            if reset:
+                with connection.cursor() as cursor:
+                    for sql in reset:
+                        cursor.execute(sql)
+    return dict(loader.loaded), time.perf_counter() - started
+
+
+def iter_batches(queryset, batch_size=BATCH_SIZE):
+    """Пачки объектов по возрастанию pk без OFFSET.
+
+    В отличие от iterator() учитывает prefetch_related, поэтому связи
+    many-to-many выгружаются одним запросом на пачку.
+    """
+    queryset = queryset.order_by('pk')
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(pk__gt=last)
+        batch = list(page[:batch_size])
+        if not batch:
+            return
+        yield batch
+        last = batch[-1].pk
+
+
+def dump_fixture(querysets, stream, batch_size=BATCH_SIZE, indent=None):
+    """Пишет объекты в поток JSON-массивом, как dumpdata."""
+    written = 0
+    stream.write('[')
+    for queryset in querysets:
+        m2m = [
+            field.name for field in queryset.model._meta.many_to_many
+            if field.remote_field.through._meta.auto_created
+        ]
+        for batch in iter_batches(
+            queryset.prefetch_related(*m2m), batch_size
+        ):
+            for obj in serialize('python', batch):
+                stream.write(',\n' if written else '\n')
+                stream.write(json.dumps(
+                    obj, cls=DjangoJSONEncoder, ensure_ascii=False,
+                    indent=indent,
+                ))
+                written += 1
+    stream.write('\n]\n')
+    return written
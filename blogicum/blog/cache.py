@@ -0,0 +1,179 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.http import HttpResponse
+from django.template import Context
+from django.template.loader import get_template
+from django.utils.http import quote_etag
+from django.utils.safestring import mark_safe
+
+
+POST_CARD_TIMEOUT = 60 * 60 * 24
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+PAGES_SCOPE = 'pages'
+FEED_SCOPE = 'feed'
+LOOKUPS_SCOPE = 'lookups'
+SYNDICATION_SCOPE = 'syndication'
+
+
+def version_key(scope):
+    return f'blog:version:{scope}'
+
+
+def get_versions(*scopes):
+    """Текущие версии областей кэша, например 'post:1' или 'category:2'.
+
+    Если версия вытеснена из кэша, она заводится заново от текущего
+    времени, чтобы не совпасть со старыми ключами фрагментов.
+    """
+    keys = {version_key(scope): scope for scope in scopes}
+    found = cache.get_many(keys)
+    versions = {keys[key]: value for key, value in found.items()}
+    for key, scope in keys.items():
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            versions[scope] = cache.get(key)
+    return versions
+
+
+def bump_versions(*scopes):
+    """Сдвигает версии областей, делая устаревшими зависящие фрагменты."""
+    for scope in scopes:
+        key = version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def post_card_scopes(post):
+    """Области, от которых зависит карточка поста."""
+    return (
+        f'post:{post.pk}',
+        f'category:{post.category_id}',
+        f'location:{post.location_id}',
+        f'user:{post.author_id}',
+    )
+
+
+def render_post_cards(posts):
+    """HTML карточек постов: из кэша или с рендерингом недостающих."""
+    posts = list(posts)
+    scopes = {post.pk: post_card_scopes(post) for post in posts}
+    versions = get_versions(*{
+        scope for post_scopes in scopes.values() for scope in post_scopes
+    })
+    keys = {
+        post.pk: 'blog:post_card:{}:{}'.format(
+            post.pk,
+            '.'.join(str(versions[scope]) for scope in scopes[post.pk])
+        )
+        for post in posts
+    }
+    cached = cache.get_many(keys.values())
+    stale = [post for post in posts if keys[post.pk] not in cached]
+    missing = {
+        keys[post.pk]: html
+        for post, html in zip(stale, render_cards(stale))
+    }
+    if missing:
+        cached.update(missing)
+        cache.set_many(missing, POST_CARD_TIMEOUT)
+    return [mark_safe(cached[keys[post.pk]]) for post in posts]
+
+
+def render_cards(posts):
+    """HTML карточек: один шаблон и один контекст на всю пачку.
+
+    {% include %} внутри карточки находит шаблон в render_context
+    контекста, поэтому загружается один раз на пачку, а не на карточку.
+    """
+    if not posts:
+        return []
+    template = get_template(POST_CARD_TEMPLATE).template
+    context = Context(autoescape=template.engine.autoescape)
+    rendered = []
+    for post in posts:
+        with context.push(post=post):
+            rendered.append(template.render(context))
+    return rendered
+
+
+def category_feed_scope(slug):
+    return f'category_feed:{slug}'
+
+
+def category_syndication_scope(slug):
+    return f'syndication:category:{slug}'
+
+
+def author_syndication_scope(username):
+    return f'syndication:author:{username}'
+
+
+def page_cache():
+    return caches[settings.BLOG_PAGE_CACHE_ALIAS]
+
+
+def page_cache_key(request, scopes):
+    scopes = (PAGES_SCOPE, *scopes)
+    versions = get_versions(*scopes)
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return 'blog:page:{}:{}'.format(
+        path, '.'.join(str(versions[scope]) for scope in scopes)
+    )
+
+
+def build_etag(request, scopes):
+    """Валидатор ETag: путь, пользователь, cookie CSRF и версии областей.
+
+    Версии сдвигаются при любом изменении данных страницы, поэтому
+    запрос к базе для проверки не нужен.
+    """
+    versions = get_versions(PAGES_SCOPE, *scopes)
+    raw = repr((
+        request.get_full_path(),
+        request.user.pk,
+        request.META.get('CSRF_COOKIE'),
+        sorted(versions.items()),
+    ))
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+# Заголовки, которые сохраняются вместе со страницей.
+PAGE_CACHE_HEADERS = ('ETag',)
+
+
+def get_cached_page(key):
+    cached = page_cache().get(key)
+    if cached is None:
+        return None
+    content, content_type, headers = cached
+    response = HttpResponse(content, content_type=content_type)
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+def store_page(key, response):
+    """Сохраняет страницу, если она не зависит от cookie.
+
+    ETag сохраняется вместе с ней: пока версии областей не сдвинуты,
+    он остаётся верным.
+    """
+    if response.status_code != 200 or response.cookies:
+        return
+    page_cache().set(
+        key,
+        (
+            response.content,
+            response['Content-Type'],
+            {
+                header: response[header] for header in PAGE_CACHE_HEADERS
+                if response.has_header(header)
+            },
+        ),
+        settings.BLOG_PAGE_CACHE_TIMEOUT,
+    )
@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.checks import Error, Tags, register, run_checks
+from django.core.exceptions import ImproperlyConfigured
+
+
+PER_PROCESS_CACHES = ('django.core.cache.backends.locmem.LocMemCache',)
+CACHE_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+def shared_cache_aliases():
+    """Кэши, которые должны быть общими для всех процессов.
+
+    В 'default' лежат версии областей и пользователи сессий, в кэше
+    сессий — сессии: в кэше процесса выход и блокировка не дошли бы
+    до других процессов.
+    """
+    aliases = {DEFAULT_CACHE_ALIAS, settings.BLOG_PAGE_CACHE_ALIAS}
+    if settings.SESSION_ENGINE in CACHE_SESSION_ENGINES:
+        aliases.add(settings.SESSION_CACHE_ALIAS)
+    return sorted(aliases)
+
+
+@register(Tags.caches)
+def check_shared_caches(app_configs, **kwargs):
+    if settings.DEBUG:
+        return []
+    return [
+        Error(
+            f'Кэш {alias!r} хранится в памяти процесса.',
+            hint='Укажите общий кэш, например FileBasedCache или Redis.',
+            id='blog.E001',
+        )
+        for alias in shared_cache_aliases()
+        if settings.CACHES[alias]['BACKEND'] in PER_PROCESS_CACHES
+    ]
+
+
+def require_shared_caches():
+    """Для wsgi.py и asgi.py: не запускать воркер без общих кэшей."""
+    errors = [
+        error for error in run_checks(tags=[Tags.caches])
+        if error.is_serious()
+    ]
+    if errors:
+        raise ImproperlyConfigured(
+            '; '.join(f'{error.id}: {error.msg}' for error in errors)
+        )
@@ -0,0 +1,166 @@
+"""Ленты RSS и Atom: все посты, категория и автор.
+
+Лента строится из get_posts() и целиком хранится в кэше страниц.
+Ключ включает версию области подписки, которую сдвигают сохранение и
+удаление поста и публикация отложенных постов; комментарии её не
+трогают. ETag вычисляется из того же ключа, поэтому повторный опрос
+без изменений получает 304 без обращения к базе.
+"""
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import quote_etag
+
+from .cache import (
+    SYNDICATION_SCOPE, author_syndication_scope, category_syndication_scope,
+    get_cached_page, page_cache_key, store_page
+)
+from .lookups import attach_lookups, get_published_category
+from .utils import get_posts
+
+
+FEED_SIZE = 20
+SITE_TITLE = 'Блогикум'
+
+User = get_user_model()
+
+
+class CachedFeed(Feed):
+    """Лента из кэша страниц с ETag, не зависящим от базы."""
+
+    def get_cache_scopes(self, **kwargs):
+        return (SYNDICATION_SCOPE,)
+
+    def __call__(self, request, *args, **kwargs):
+        key = page_cache_key(request, self.get_cache_scopes(**kwargs))
+        etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            response['ETag'] = etag
+            return response
+        response = get_cached_page(key)
+        if response is None:
+            response = super().__call__(request, *args, **kwargs)
+            # Как и у страниц, проверка идёт только по ETag.
+            if response.has_header('Last-Modified'):
+                del response['Last-Modified']
+            response['ETag'] = etag
+            store_page(key, response)
+        return response
+
+    def get_posts(self, obj):
+        return get_posts()
+
+    def items(self, obj):
+        return attach_lookups(list(self.get_posts(obj)[:FEED_SIZE]))
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.text_html
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', kwargs={'post_id': post.pk})
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+    def item_author_link(self, post):
+        return reverse(
+            'blog:profile', kwargs={'username': post.author.username}
+        )
+
+    def item_categories(self, post):
+        return (post.category.title,)
+
+
+class PostsFeed(CachedFeed):
+    """Все посты в RSS"""
+
+    title = SITE_TITLE
+    link = reverse_lazy('blog:index')
+    description = 'Новые публикации'
+
+
+class PostsAtomFeed(PostsFeed):
+    """Все посты в Atom"""
+
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class CategoryFeed(CachedFeed):
+    """Посты категории в RSS"""
+
+    def get_cache_scopes(self, **kwargs):
+        return (category_syndication_scope(kwargs['category_slug']),)
+
+    def get_object(self, request, category_slug):
+        category = get_published_category(category_slug)
+        if category is None:
+            raise Http404('Категория не найдена')
+        return category
+
+    def get_posts(self, category):
+        return get_posts().filter(category=category)
+
+    def title(self, category):
+        return f'{SITE_TITLE}: {category.title}'
+
+    def link(self, category):
+        return reverse(
+            'blog:category_posts', kwargs={'category_slug': category.slug}
+        )
+
+    def description(self, category):
+        return category.description
+
+
+class CategoryAtomFeed(CategoryFeed):
+    """Посты категории в Atom"""
+
+    feed_type = Atom1Feed
+
+    def subtitle(self, category):
+        return category.description
+
+
+class ProfileFeed(CachedFeed):
+    """Посты автора в RSS"""
+
+    def get_cache_scopes(self, **kwargs):
+        return (author_syndication_scope(kwargs['username']),)
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def get_posts(self, author):
+        return get_posts().filter(author=author)
+
+    def title(self, author):
+        return f'{SITE_TITLE}: {author.get_full_name() or author.username}'
+
+    def link(self, author):
+        return reverse('blog:profile', kwargs={'username': author.username})
+
+    def description(self, author):
+        return f'Публикации пользователя {author.username}'
+
+
+class ProfileAtomFeed(ProfileFeed):
+    """Посты автора в Atom"""
+
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return self.description(author)
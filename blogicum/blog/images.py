@@ -0,0 +1,61 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+
+IMAGE_WIDTHS = (320, 640, 960)
+IMAGE_FORMAT = 'WEBP'
+IMAGE_EXTENSION = 'webp'
+IMAGE_QUALITY = 80
+DERIVATIVES_DIR = 'posts_images/derivatives'
+
+
+def derivative_name(name, width):
+    stem = os.path.basename(name).replace('.', '_')
+    return f'{DERIVATIVES_DIR}/{stem}_{width}w.{IMAGE_EXTENSION}'
+
+
+def generate_derivatives(field_file):
+    """Сохраняет копии изображения и возвращает их ширины.
+
+    Копии перекодируются в WebP без EXIF; поворот из EXIF применяется
+    заранее. Ширины меньше исходной, чтобы не растягивать фото, а
+    последняя копия — в исходную ширину, чтобы srcset не ограничивал
+    разрешение на широких экранах.
+    """
+    storage = field_file.storage
+    with field_file.open('rb'), Image.open(field_file) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+        widths = [width for width in IMAGE_WIDTHS if width < image.width]
+        widths.append(image.width)
+        for width in widths:
+            height = round(image.height * width / image.width)
+            buffer = BytesIO()
+            image.resize((width, height), Image.LANCZOS).save(
+                buffer, IMAGE_FORMAT, quality=IMAGE_QUALITY
+            )
+            name = derivative_name(field_file.name, width)
+            if storage.exists(name):
+                storage.delete(name)
+            storage.save(name, ContentFile(buffer.getvalue()))
+    return widths
+
+
+def variant_urls(field_file, widths):
+    storage = field_file.storage
+    return [
+        (width, storage.url(derivative_name(field_file.name, width)))
+        for width in widths
+    ]
+
+
+def delete_derivatives(storage, name, widths):
+    """Удаляет копии изображения name, оставшиеся от прежнего фото."""
+    for width in widths:
+        path = derivative_name(name, width)
+        if storage.exists(path):
+            storage.delete(path)
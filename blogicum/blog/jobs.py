@@ -0,0 +1,118 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from blogicum.db_routers import use_primary
+
+from .models import Job
+
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+CRASHED_ERROR = 'Воркер не завершил задачу за max_attempts попыток'
+
+
+def job(func):
+    """Регистрирует функцию как фоновую задачу.
+
+    Аргументы задачи передаются именованными и должны сериализоваться
+    в JSON. Вызов func.delay(**kwargs) ставит задачу в очередь,
+    func.schedule(run_after, **kwargs) — на заданное время.
+    """
+    name = f'{func.__module__}.{func.__name__}'
+    registry[name] = func
+    func.job_name = name
+    func.delay = lambda **payload: enqueue(name, **payload)
+    func.schedule = lambda run_after, **payload: enqueue(
+        name, run_after=run_after, **payload
+    )
+    return func
+
+
+def enqueue(name, run_after=None, **payload):
+    """Ставит задачу в очередь в рамках текущей транзакции.
+
+    В режиме EAGER задача без run_after выполняется сразу после
+    коммита, а задача на будущее всё равно ждёт воркера в очереди.
+    """
+    if settings.BLOG_JOBS_EAGER and (
+        run_after is None or run_after <= timezone.now()
+    ):
+        transaction.on_commit(lambda: registry[name](**payload))
+        return None
+    if run_after is None:
+        return Job.objects.create(name=name, payload=payload)
+    return Job.objects.create(name=name, payload=payload, run_after=run_after)
+
+
+def claim(limit, visibility_timeout):
+    """Забирает готовые задачи, скрывая их от других воркеров.
+
+    Захват — условный UPDATE по locked_until, поэтому он работает и
+    без SELECT ... FOR UPDATE. Если воркер упал, задача снова станет
+    видна после истечения visibility_timeout; задача, исчерпавшая
+    max_attempts, вместо этого помечается FAILED.
+    """
+    now = timezone.now()
+    free = Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    retry = Q(attempts__lt=F('max_attempts'))
+    Job.objects.filter(free, ~retry, status=Job.QUEUED).update(
+        status=Job.FAILED,
+        locked_until=None,
+        last_error=CRASHED_ERROR,
+    )
+    candidates = Job.objects.filter(
+        free, retry, status=Job.QUEUED, run_after__lte=now
+    ).values_list('pk', flat=True)[:limit]
+    claimed = []
+    for pk in candidates:
+        updated = Job.objects.filter(free, retry, pk=pk).update(
+            locked_until=now + timedelta(seconds=visibility_timeout),
+            attempts=F('attempts') + 1,
+        )
+        if updated:
+            claimed.append(pk)
+    return list(Job.objects.filter(pk__in=claimed))
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=min(2 ** attempts * 5, 60 * 60))
+
+
+def run(job):
+    """Выполняет задачу: удаляет при успехе, иначе планирует повтор."""
+    try:
+        func = registry[job.name]
+        with use_primary():
+            func(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Фоновая задача %s завершилась ошибкой', job.name)
+        Job.objects.filter(pk=job.pk).update(
+            status=(
+                Job.FAILED if job.attempts >= job.max_attempts else Job.QUEUED
+            ),
+            run_after=timezone.now() + retry_delay(job.attempts),
+            locked_until=None,
+            last_error=error,
+        )
+        return False
+    Job.objects.filter(pk=job.pk).delete()
+    return True
+
+
+def run_pending(limit=10, visibility_timeout=None):
+    """Выполняет пачку готовых задач и возвращает их число."""
+    if visibility_timeout is None:
+        visibility_timeout = settings.BLOG_JOBS_VISIBILITY_TIMEOUT
+    jobs = claim(limit, visibility_timeout)
+    for pending in jobs:
+        run(pending)
+    return len(jobs)
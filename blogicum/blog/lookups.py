@@ -0,0 +1,103 @@
+"""Справочники категорий и мест в памяти процесса.
+
+Таблицы маленькие и меняются редко, поэтому запросы лент не
+присоединяют их к постам: категории и места подставляются из словарей
+процесса. Словари перечитываются, когда сдвигается версия области
+LOOKUPS_SCOPE в общем кэше; её сдвигают сигналы сохранения и удаления
+категорий и мест. Объекты общие для всех запросов процесса и только
+читаются.
+
+Новый снимок строит не запрос, а те же сигналы после коммита
+(refresh_lookups): он кладётся в общий кэш под ключом версии, и
+процессы берут его оттуда без запросов к базе. Из базы запрос читает
+справочники, только если снимок вытеснен из кэша.
+"""
+from django.core.cache import cache
+
+from blogicum.db_routers import use_primary
+
+from .cache import LOOKUPS_SCOPE, get_versions
+from .models import Category, Location, Post
+
+
+LOOKUPS_TIMEOUT = 60 * 60 * 24
+
+
+class Lookups:
+    """Снимок справочников для одной версии области."""
+
+    def __init__(self, version):
+        self.version = version
+        self.categories = {
+            category.pk: category for category in Category.objects.all()
+        }
+        self.locations = {
+            location.pk: location for location in Location.objects.all()
+        }
+        self.category_slugs = {
+            category.slug: category
+            for category in self.categories.values()
+        }
+        # Ленты исключают снятые категории, а не перечисляют
+        # опубликованные: иначе SQLite выбирает индекс категорий
+        # и сортирует ленту заново.
+        self.unpublished_category_ids = sorted(
+            pk for pk, category in self.categories.items()
+            if not category.is_published
+        )
+
+
+_lookups = None
+
+
+def lookups_key(version):
+    return f'blog:lookups:{version}'
+
+
+def refresh_lookups():
+    """Строит снимок текущей версии и кладёт его в общий кэш."""
+    version = get_versions(LOOKUPS_SCOPE)[LOOKUPS_SCOPE]
+    with use_primary():
+        lookups = Lookups(version)
+    cache.set(lookups_key(version), lookups, LOOKUPS_TIMEOUT)
+    return lookups
+
+
+def get_lookups():
+    """Текущий снимок справочников, взятый заново при смене версии."""
+    global _lookups
+    version = get_versions(LOOKUPS_SCOPE)[LOOKUPS_SCOPE]
+    if _lookups is None or _lookups.version != version:
+        _lookups = cache.get(lookups_key(version)) or refresh_lookups()
+    return _lookups
+
+
+def unpublished_category_ids():
+    return get_lookups().unpublished_category_ids
+
+
+def get_published_category(slug):
+    """Опубликованная категория по slug или None."""
+    category = get_lookups().category_slugs.get(slug)
+    if category is None or not category.is_published:
+        return None
+    return category
+
+
+def attach_lookups(posts):
+    """Подставляет постам категории и места вместо запросов к базе.
+
+    Связь, которой ещё нет в снимке, остаётся незагруженной и при
+    обращении читается из базы как обычно.
+    """
+    lookups = get_lookups()
+    for post in posts:
+        for field, objects, pk in (
+            (Post.category.field, lookups.categories, post.category_id),
+            (Post.location.field, lookups.locations, post.location_id),
+        ):
+            if pk is None:
+                field.set_cached_value(post, None)
+            elif pk in objects:
+                field.set_cached_value(post, objects[pk])
+    return posts
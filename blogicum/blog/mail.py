@@ -0,0 +1,37 @@
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .tasks import send_email
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Почтовый бэкенд, который ставит письма в очередь фоновых задач.
+
+    Письма отправляет воркер через BLOG_QUEUED_EMAIL_BACKEND.
+    Вложения не сериализуются в аргументы задачи, поэтому письмо с
+    ними отклоняется, а не уходит без них.
+    """
+
+    def send_messages(self, email_messages):
+        for message in email_messages:
+            if message.attachments:
+                raise ValueError(
+                    'QueuedEmailBackend не поддерживает вложения: '
+                    f'{message.subject!r}'
+                )
+        messages = [
+            {
+                'subject': message.subject,
+                'body': message.body,
+                'from_email': message.from_email,
+                'to': list(message.to),
+                'cc': list(message.cc),
+                'bcc': list(message.bcc),
+                'reply_to': list(message.reply_to),
+                'headers': dict(message.extra_headers),
+                'alternatives': list(getattr(message, 'alternatives', [])),
+            }
+            for message in email_messages
+        ]
+        if messages:
+            send_email.delay(messages=messages)
+        return len(messages)
@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from blog.benchmarks import (
+    asgi_client, async_views, clear_caches, seed, temporary_database,
+    wsgi_client
+)
+
+
+class Command(BaseCommand):
+    help = ('Медленные клиенты лент, поста и профиля: один воркер ASGI '
+            'с асинхронными view против одного синхронного воркера WSGI')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=100)
+        parser.add_argument(
+            '--delay', type=float, default=0.02,
+            help='Секунд на отправку запроса и столько же на чтение ответа',
+        )
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            data = seed()
+            clear_caches()
+            paths = [
+                reverse('blog:index'),
+                reverse(
+                    'blog:category_posts',
+                    kwargs={'category_slug': 'category'},
+                ),
+                reverse(
+                    'blog:post_detail', kwargs={'post_id': data['post'].pk}
+                ),
+                reverse(
+                    'blog:profile',
+                    kwargs={'username': data['author'].username},
+                ),
+            ]
+            paths = [
+                paths[number % len(paths)]
+                for number in range(options['clients'])
+            ]
+            results = []
+            for delay in (0, options['delay']):
+                results.append((
+                    delay,
+                    self.run_wsgi(paths, delay),
+                    self.run_asgi(paths, delay),
+                ))
+        self.stdout.write(
+            f'{"задержка, мс":>12} {"WSGI, с":>8} {"запр./с":>8} '
+            f'{"ASGI, с":>8} {"запр./с":>8}'
+        )
+        for delay, wsgi_seconds, asgi_seconds in results:
+            self.stdout.write(
+                f'{delay * 1000:>12.0f} {wsgi_seconds:>8.2f} '
+                f'{len(paths) / wsgi_seconds:>8.0f} '
+                f'{asgi_seconds:>8.2f} {len(paths) / asgi_seconds:>8.0f}'
+            )
+
+    @staticmethod
+    def check_responses(responses, paths):
+        for path, (status, body) in zip(paths, responses):
+            if status != 200 or not body:
+                raise CommandError(f'{path}: ответ {status}')
+
+    def run_wsgi(self, paths, delay):
+        application = WSGIHandler()
+        for path in set(paths):
+            wsgi_client(application, path, 0)
+        started = time.perf_counter()
+        responses = [wsgi_client(application, path, delay) for path in paths]
+        elapsed = time.perf_counter() - started
+        self.check_responses(responses, paths)
+        return elapsed
+
+    def run_asgi(self, paths, delay):
+        with async_views():
+            application = ASGIHandler()
+
+            async def serve():
+                for path in set(paths):
+                    await asgi_client(application, path, 0)
+                started = time.perf_counter()
+                responses = await asyncio.gather(*(
+                    asgi_client(application, path, delay) for path in paths
+                ))
+                return time.perf_counter() - started, responses
+
+            elapsed, responses = asyncio.run(serve())
+        self.check_responses(responses, paths)
+        return elapsed
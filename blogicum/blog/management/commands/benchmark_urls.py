@@ -0,0 +1,357 @@
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from faker import Faker
+
+from blog.benchmarks import clear_caches, temporary_database
+from blog.lookups import refresh_lookups
+from blog.models import Category, Comment, Location, Post
+from blog.publishing import publish_due_posts
+from blog.utils import get_posts, rebuild_comments_count, rebuild_post_text
+
+
+User = get_user_model()
+
+PASSWORD = 'benchmark'
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(samples, rank):
+    """Перцентиль методом ближайшего ранга."""
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(rank / 100 * len(ordered)) - 1, 0)]
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный бенчмарк всех URL blog и pages на временной '
+            'тестовой базе с результатами в JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=20)
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument(
+            '--requests', type=int, default=100,
+            help='Запросов к каждому URL',
+        )
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument(
+            '--cold', action='store_true',
+            help='Очищать кэши перед каждым запросом',
+        )
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--output', help='Куда записать JSON')
+        parser.add_argument(
+            '--compare', help='JSON предыдущего запуска для сравнения'
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=10.0,
+            help='Допустимый рост p95, проценты',
+        )
+
+    def handle(self, *args, **options):
+        routes = self.routes()
+        with temporary_database():
+            started = time.perf_counter()
+            data = self.seed(options)
+            seconds = time.perf_counter() - started
+            self.stdout.write(f'База заполнена за {seconds:.1f} с')
+            results = self.run(routes, data, options)
+        report = {
+            'meta': {
+                'commit': current_commit(),
+                'created_at': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                **{
+                    key: options[key] for key in (
+                        'users', 'categories', 'locations', 'posts',
+                        'comments', 'requests', 'warmup', 'cold', 'seed',
+                    )
+                },
+            },
+            'routes': results,
+        }
+        self.print_results(results)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+        if options['compare']:
+            self.compare(options['compare'], results, options['threshold'])
+
+    @staticmethod
+    def routes():
+        """Сценарии: (имя URL, клиент, метод, kwargs и данные запроса)."""
+        return (
+            ('blog:index', 'anonymous', 'get',
+             lambda data, rng: ({}, {})),
+            ('blog:search', 'anonymous', 'get',
+             lambda data, rng: ({}, {'q': rng.choice(data['words'])})),
+            ('blog:post_detail', 'anonymous', 'get',
+             lambda data, rng: ({'post_id': rng.choice(data['posts'])}, {})),
+            ('blog:category_posts', 'anonymous', 'get',
+             lambda data, rng: (
+                 {'category_slug': rng.choice(data['categories'])}, {}
+             )),
+            ('blog:profile', 'anonymous', 'get',
+             lambda data, rng: (
+                 {'username': rng.choice(data['usernames'])}, {}
+             )),
+            ('blog:api_posts', 'anonymous', 'get',
+             lambda data, rng: ({}, {})),
+            ('blog:api_category_posts', 'anonymous', 'get',
+             lambda data, rng: (
+                 {'category_slug': rng.choice(data['categories'])}, {}
+             )),
+            ('blog:api_profile_posts', 'anonymous', 'get',
+             lambda data, rng: (
+                 {'username': rng.choice(data['usernames'])}, {}
+             )),
+            ('blog:api_post_comments', 'anonymous', 'get',
+             lambda data, rng: ({'post_id': rng.choice(data['posts'])}, {})),
+            ('blog:posts_rss', 'anonymous', 'get',
+             lambda data, rng: ({}, {})),
+            ('blog:posts_atom', 'anonymous', 'get',
+             lambda data, rng: ({}, {})),
+            ('blog:category_rss', 'anonymous', 'get',
+             lambda data, rng: (
+                 {'category_slug': rng.choice(data['categories'])}, {}
+             )),
+            ('blog:category_atom', 'anonymous', 'get',
+             lambda data, rng: (
+                 {'category_slug': rng.choice(data['categories'])}, {}
+             )),
+            ('blog:profile_rss', 'anonymous', 'get',
+             lambda data, rng: (
+                 {'username': rng.choice(data['usernames'])}, {}
+             )),
+            ('blog:profile_atom', 'anonymous', 'get',
+             lambda data, rng: (
+                 {'username': rng.choice(data['usernames'])}, {}
+             )),
+            ('blog:add_comment', 'author', 'post',
+             lambda data, rng: (
+                 {'post_id': rng.choice(data['posts'])},
+                 {'text': 'Комментарий из бенчмарка'},
+             )),
+            ('blog:create_post', 'author', 'get',
+             lambda data, rng: ({}, {})),
+            ('blog:edit_post', 'author', 'get',
+             lambda data, rng: (
+                 {'post_id': rng.choice(data['own_posts'])}, {}
+             )),
+            ('blog:delete_post', 'author', 'get',
+             lambda data, rng: (
+                 {'post_id': rng.choice(data['own_posts'])}, {}
+             )),
+            ('blog:edit_comment', 'author', 'get',
+             lambda data, rng: rng.choice(data['own_comments'])),
+            ('blog:delete_comment', 'author', 'get',
+             lambda data, rng: rng.choice(data['own_comments'])),
+            ('blog:edit_profile', 'author', 'get',
+             lambda data, rng: ({'pk': data['author'].pk}, {})),
+            ('pages:about', 'anonymous', 'get',
+             lambda data, rng: ({}, {})),
+            ('pages:rules', 'anonymous', 'get',
+             lambda data, rng: ({}, {})),
+        )
+
+    @staticmethod
+    def seed(options):
+        """Пользователи, категории, места, посты в прошлом и будущем."""
+        fake = Faker('ru_RU')
+        Faker.seed(options['seed'])
+        rng = random.Random(options['seed'])
+        password = make_password(PASSWORD)
+        # SQLite не возвращает id из bulk_create: объекты перечитываются.
+        User.objects.bulk_create(
+            User(username=f'{fake.user_name()}{number}', password=password)
+            for number in range(max(options['users'], 1))
+        )
+        Category.objects.bulk_create(
+            Category(
+                title=fake.sentence(nb_words=2)[:256],
+                description=fake.paragraph(),
+                slug=f'category-{number}',
+                # Каждая десятая категория снята с публикации.
+                is_published=number % 10 != 9,
+            )
+            for number in range(max(options['categories'], 1))
+        )
+        Location.objects.bulk_create(
+            Location(name=fake.city_name())
+            for _ in range(options['locations'])
+        )
+        # Сигналы не отправлялись: справочники строятся, как после commit.
+        refresh_lookups()
+        users = list(User.objects.order_by('pk'))
+        categories = list(Category.objects.order_by('pk'))
+        locations = list(Location.objects.all())
+        now = timezone.now()
+        Post.objects.bulk_create(
+            (
+                Post(
+                    title=fake.sentence(nb_words=5)[:256],
+                    text=fake.text(max_nb_chars=1500),
+                    # Около 10% постов отложены на будущее.
+                    pub_date=now + timezone.timedelta(
+                        hours=rng.uniform(-24 * 365, 24 * 36)
+                    ),
+                    is_published=rng.random() > 0.05,
+                    author=rng.choice(users),
+                    category=rng.choice(categories),
+                    location=rng.choice(locations + [None]),
+                )
+                for _ in range(options['posts'])
+            ),
+            batch_size=500,
+        )
+        # bulk_create не вызывает save(): флаг и анонсы ставятся отдельно.
+        publish_due_posts(now)
+        rebuild_post_text()
+        author = users[0]
+        visible = list(get_posts().values_list('id', flat=True))
+        if not visible:
+            raise CommandError('Нет опубликованных постов, увеличьте --posts')
+        Comment.objects.bulk_create(
+            (
+                Comment(
+                    post_id=rng.choice(visible),
+                    author=rng.choice(users),
+                    text=fake.sentence(),
+                )
+                for _ in range(options['comments'])
+            ),
+            batch_size=1000,
+        )
+        own_post = Post.objects.create(
+            title='Пост автора бенчмарка',
+            text=fake.text(),
+            pub_date=now,
+            author=author,
+            category=categories[0],
+        )
+        own_comment = Comment.objects.create(
+            post=own_post, author=author, text=fake.sentence()
+        )
+        rebuild_comments_count()
+        return {
+            'author': author,
+            'posts': visible,
+            'own_posts': list(
+                author.posts.values_list('id', flat=True)
+            ),
+            'own_comments': [
+                ({'post_id': own_post.pk, 'comment_id': own_comment.pk}, {})
+            ],
+            'categories': list(
+                Category.objects.filter(is_published=True)
+                .values_list('slug', flat=True)
+            ),
+            'usernames': [user.username for user in users],
+            'words': fake.words(nb=50),
+        }
+
+    @staticmethod
+    def run(routes, data, options):
+        rng = random.Random(options['seed'])
+        clients = {'anonymous': Client(), 'author': Client()}
+        clients['author'].force_login(data['author'])
+        results = {}
+        for name, who, method, make_request in routes:
+            client = getattr(clients[who], method)
+            latencies, queries = [], []
+            for number in range(options['warmup'] + options['requests']):
+                kwargs, payload = make_request(data, rng)
+                url = reverse(name, kwargs=kwargs)
+                if options['cold']:
+                    clear_caches()
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = client(url, payload)
+                    elapsed = time.perf_counter() - started
+                if response.status_code >= 400:
+                    raise CommandError(f'{url}: ответ {response.status_code}')
+                if number >= options['warmup']:
+                    latencies.append(elapsed)
+                    queries.append(len(captured))
+            total = sum(latencies)
+            results[name] = {
+                'requests': len(latencies),
+                'rps': round(len(latencies) / total, 1),
+                'mean_ms': round(total * 1000 / len(latencies), 3),
+                **{
+                    f'p{rank}_ms': round(
+                        percentile(latencies, rank) * 1000, 3
+                    )
+                    for rank in PERCENTILES
+                },
+                'queries_mean': round(sum(queries) / len(queries), 2),
+                'queries_max': max(queries),
+            }
+        return results
+
+    def print_results(self, results):
+        self.stdout.write(
+            f'{"URL":<22} {"RPS":>8} {"p50 мс":>8} {"p95 мс":>8} '
+            f'{"p99 мс":>8} {"запр.":>6} {"макс":>5}'
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<22} {result["rps"]:>8.1f} '
+                f'{result["p50_ms"]:>8.2f} {result["p95_ms"]:>8.2f} '
+                f'{result["p99_ms"]:>8.2f} {result["queries_mean"]:>6.1f} '
+                f'{result["queries_max"]:>5}'
+            )
+
+    def compare(self, path, results, threshold):
+        with open(path, encoding='utf-8') as file:
+            baseline = json.load(file)
+        self.stdout.write(
+            f'\nСравнение с {path} (коммит {baseline["meta"]["commit"]}):'
+        )
+        regressions = []
+        for name, result in results.items():
+            before = baseline['routes'].get(name)
+            if before is None:
+                continue
+            change = (result['p95_ms'] / before['p95_ms'] - 1) * 100
+            queries = result['queries_mean'] - before['queries_mean']
+            regressed = change > threshold or queries > 0
+            if regressed:
+                regressions.append(name)
+            style = self.style.ERROR if regressed else self.style.SUCCESS
+            self.stdout.write(style(
+                f'{name:<22} p95 {before["p95_ms"]:>8.2f} → '
+                f'{result["p95_ms"]:>8.2f} мс ({change:+.1f}%), '
+                f'запросов {before["queries_mean"]:.1f} → '
+                f'{result["queries_mean"]:.1f}'
+            ))
+        if regressions:
+            raise CommandError(f'Регрессии: {", ".join(regressions)}')
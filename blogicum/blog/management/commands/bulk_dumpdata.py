@@ -0,0 +1,75 @@
+import sys
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, router
+
+from blog.bulk import BATCH_SIZE, dependency_order, dump_fixture
+
+
+class Command(BaseCommand):
+    help = ('Потоковая выгрузка моделей в JSON-фикстуру формата dumpdata '
+            'пачками по pk')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'labels', nargs='*',
+            help='app_label или app_label.Model, по умолчанию все модели',
+        )
+        parser.add_argument(
+            '-e', '--exclude', action='append', default=[],
+            help='app_label или app_label.Model, которые не выгружать',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--indent', type=int)
+        parser.add_argument('-o', '--output', help='Файл, по умолчанию stdout')
+
+    def handle(self, *args, **options):
+        using = options['database']
+        excluded = self.get_models(options['exclude'], default=())
+        models = [
+            model for model in self.get_models(options['labels'])
+            if model not in excluded
+            and not model._meta.proxy
+            and router.allow_migrate_model(using, model)
+        ]
+        stream = (
+            open(options['output'], 'w', encoding='utf-8')
+            if options['output'] else sys.stdout
+        )
+        started = time.perf_counter()
+        try:
+            written = dump_fixture(
+                (
+                    model._default_manager.using(using).all()
+                    for model in dependency_order(models)
+                ),
+                stream,
+                batch_size=options['batch_size'],
+                indent=options['indent'],
+            )
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        seconds = time.perf_counter() - started
+        self.stderr.write(
+            f'Выгружено объектов: {written} за {seconds:.2f} с '
+            f'({written / max(seconds, 1e-9):.0f} объектов/с)'
+        )
+
+    @staticmethod
+    def get_models(labels, default=None):
+        if not labels:
+            return list(apps.get_models()) if default is None else default
+        models = []
+        for label in labels:
+            try:
+                if '.' in label:
+                    models.append(apps.get_model(label))
+                else:
+                    models.extend(apps.get_app_config(label).get_models())
+            except LookupError as error:
+                raise CommandError(error)
+        return models
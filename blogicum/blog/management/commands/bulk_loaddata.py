@@ -0,0 +1,92 @@
+import sys
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.base import DeserializationError
+from django.db import DEFAULT_DB_ALIAS, IntegrityError
+
+from blog.bulk import BATCH_SIZE, load_fixture
+from blog.cache import (
+    FEED_SCOPE, LOOKUPS_SCOPE, PAGES_SCOPE, category_feed_scope
+)
+from blog.lookups import refresh_lookups
+from blog.models import Category, Comment, Location, Post
+from blog.publishing import publish_due_posts
+from blog.search import has_search_index, rebuild_search_index
+from blog.tasks import bump_versions_after_write, schedule_publication
+from blog.utils import rebuild_comments_count, rebuild_post_text
+
+
+class Command(BaseCommand):
+    help = ('Потоковая загрузка фикстуры в формате loaddata через '
+            'многострочные INSERT, например blogicum/db.json; строки с '
+            'уже занятым pk заменяются, как в loaddata')
+
+    def add_arguments(self, parser):
+        parser.add_argument('fixture', help='Путь к JSON или - для stdin')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--defer-indexes',
+            action='store_true',
+            help='Снять индексы и триггеры таблиц blog на время загрузки',
+        )
+        parser.add_argument(
+            '--signals',
+            action='store_true',
+            help='Отправлять pre_save и post_save с raw=True, как loaddata',
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        defer_indexes = ()
+        if options['defer_indexes']:
+            defer_indexes = list(apps.get_app_config('blog').get_models())
+        stream = (
+            sys.stdin if options['fixture'] == '-'
+            else open(options['fixture'], encoding='utf-8')
+        )
+        try:
+            loaded, seconds = load_fixture(
+                stream,
+                using,
+                defer_indexes=defer_indexes,
+                batch_size=options['batch_size'],
+                send_signals=options['signals'],
+            )
+        except (DeserializationError, IntegrityError) as error:
+            raise CommandError(f'Фикстура не загружена: {error}')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        self.refresh_blog(loaded, using)
+        total = sum(loaded.values())
+        for model, rows in loaded.items():
+            self.stdout.write(f'{model._meta.label:<40} {rows:>10}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {total} за {seconds:.2f} с '
+            f'({total / max(seconds, 1e-9):.0f} строк/с)'
+        ))
+
+    @staticmethod
+    def refresh_blog(loaded, using):
+        """Производные данные, которые bulk_create не обновляет."""
+        if Post in loaded and using == DEFAULT_DB_ALIAS:
+            publish_due_posts()
+            schedule_publication()
+        if Post in loaded:
+            rebuild_post_text(Post.objects.using(using).filter(excerpt=''))
+        if loaded.keys() & {Post, Comment}:
+            rebuild_comments_count(Post.objects.using(using))
+        if loaded.keys() & {Post, Category, Location}:
+            if has_search_index() and using == DEFAULT_DB_ALIAS:
+                rebuild_search_index()
+            bump_versions_after_write(
+                LOOKUPS_SCOPE,
+                PAGES_SCOPE,
+                FEED_SCOPE,
+                *map(category_feed_scope, Category.objects.using(using)
+                     .values_list('slug', flat=True)),
+            )
+            if using == DEFAULT_DB_ALIAS:
+                refresh_lookups()
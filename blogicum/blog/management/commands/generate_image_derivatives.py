@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.utils import update_image_variants
+
+
+class Command(BaseCommand):
+    help = 'Создаёт уменьшенные копии фото для уже загруженных постов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать копии и у постов, где они уже есть',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='')
+        if not options['force']:
+            posts = posts.filter(image_variants=[])
+        done = failed = 0
+        for post in posts.iterator():
+            try:
+                update_image_variants(post)
+            except (OSError, ValueError) as error:
+                failed += 1
+                self.stderr.write(f'Пост {post.pk}: {error}')
+            else:
+                done += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Обработано фото: {done}, с ошибками: {failed}'
+        ))
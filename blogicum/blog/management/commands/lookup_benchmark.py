@@ -0,0 +1,163 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from faker import Faker
+
+from blog.benchmarks import temporary_database
+from blog.cache import POST_CARD_TEMPLATE
+from blog.lookups import attach_lookups, get_published_category
+from blog.models import Category, Location, Post
+from blog.publishing import publish_due_posts
+from blog.utils import get_posts, rebuild_post_text
+
+
+User = get_user_model()
+
+PAGE_SIZE = 10
+
+
+def joined_feed():
+    """Лента в прежнем виде: категории и места присоединяются JOIN."""
+    return Post.objects.select_related(
+        'location', 'author', 'category'
+    ).filter(
+        is_live=True,
+        category__is_published=True
+    ).order_by('-pub_date', '-id')
+
+
+def joined_page(slug=None):
+    if slug is None:
+        return list(joined_feed()[:PAGE_SIZE])
+    get_object_or_404(Category, slug=slug, is_published=True)
+    return list(joined_feed().filter(category__slug=slug)[:PAGE_SIZE])
+
+
+def lookup_page(slug=None):
+    posts = get_posts()
+    if slug is not None:
+        posts = posts.filter(category=get_published_category(slug))
+    return attach_lookups(list(posts[:PAGE_SIZE]))
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает страницы ленты и категории с JOIN категорий '
+            'и мест и со справочниками в памяти на временной базе')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--pages', type=int, default=200)
+        parser.add_argument(
+            '--repeat', type=int, default=7,
+            help='Число прогонов; время берётся по медиане',
+        )
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        renders = {'JOIN': joined_page, 'справочники': lookup_page}
+        with temporary_database():
+            slugs = self.seed(options)
+            rng = random.Random(options['seed'])
+            pages = [
+                rng.choice(slugs + [None]) for _ in range(options['pages'])
+            ]
+            # Справочники загружаются один раз на процесс, не на страницу;
+            # прогрев заодно компилирует шаблон карточки.
+            for render in renders.values():
+                self.measure(render, pages[:1])
+            timings = {name: [] for name in renders}
+            queries = {}
+            # Варианты чередуются, чтобы фоновая нагрузка машины
+            # сказывалась на обоих одинаково.
+            for _ in range(max(options['repeat'], 1)):
+                for name, render in renders.items():
+                    seconds, queries[name] = self.measure(render, pages)
+                    timings[name].append(seconds * 1000 / len(pages))
+        self.stdout.write(
+            f'Постов: {options["posts"]}, страниц: {options["pages"]}, '
+            f'прогонов: {len(timings["JOIN"])}'
+        )
+        for name, runs in timings.items():
+            self.stdout.write(
+                f'{name:>12}: {queries[name] / len(pages):.2f} запроса, '
+                f'медиана {statistics.median(runs):.2f} мс '
+                f'({min(runs):.2f}–{max(runs):.2f}) на страницу'
+            )
+        joined, cached = (queries[name] / len(pages) for name in renders)
+        self.stdout.write(
+            f'Запросов на страницу: {joined:.2f} -> {cached:.2f} '
+            f'(на {joined - cached:.2f} меньше)'
+        )
+        joined_runs, cached_runs = timings.values()
+        difference = (
+            statistics.median(joined_runs) - statistics.median(cached_runs)
+        )
+        if min(joined_runs) <= max(cached_runs):
+            self.stdout.write(
+                f'Разница медиан {difference:.2f} мс в пределах разброса '
+                f'прогонов: по времени выигрыш не доказан'
+            )
+        else:
+            self.stdout.write(
+                f'Разница медиан: {difference:.2f} мс на страницу'
+            )
+
+    @staticmethod
+    def measure(render, pages):
+        """Запрос страницы и рендеринг её карточек без кэша фрагментов."""
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for slug in pages:
+                for post in render(slug):
+                    render_to_string(POST_CARD_TEMPLATE, {'post': post})
+            seconds = time.perf_counter() - started
+        return seconds, len(queries)
+
+    @staticmethod
+    def seed(options):
+        fake = Faker('ru_RU')
+        Faker.seed(options['seed'])
+        rng = random.Random(options['seed'])
+        author = User.objects.create(username='benchmark')
+        categories = [
+            Category.objects.create(
+                title=fake.sentence(nb_words=2)[:256],
+                description=fake.paragraph(),
+                slug=f'category-{number}',
+            )
+            for number in range(max(options['categories'], 1))
+        ]
+        locations = [
+            Location.objects.create(name=fake.city_name())
+            for _ in range(options['locations'])
+        ]
+        pub_date = timezone.now() - timezone.timedelta(days=1)
+        Post.objects.bulk_create(
+            (
+                Post(
+                    title=fake.sentence(nb_words=5)[:256],
+                    text=fake.text(max_nb_chars=500),
+                    pub_date=pub_date - timezone.timedelta(
+                        minutes=number
+                    ),
+                    author=author,
+                    category=rng.choice(categories),
+                    location=rng.choice(locations + [None]),
+                )
+                for number in range(options['posts'])
+            ),
+            batch_size=500,
+        )
+        publish_due_posts()
+        rebuild_post_text()
+        return [category.slug for category in categories]
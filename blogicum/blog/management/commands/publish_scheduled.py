@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.publishing import next_publication, publish_due_posts
+from blog.tasks import schedule_publication
+
+
+class Command(BaseCommand):
+    help = ('Показывает в лентах отложенные посты, время которых наступило; '
+            'без --once ждёт следующих публикаций')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Опубликовать наступившие, запланировать задачу и выйти',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60.0,
+            help='Наибольшая пауза между проверками в секундах',
+        )
+
+    def handle(self, *args, **options):
+        if options['once']:
+            published = publish_due_posts()
+            schedule_publication()
+            self.stdout.write(
+                self.style.SUCCESS(f'Опубликовано постов: {len(published)}')
+            )
+            return
+        while True:
+            published = publish_due_posts()
+            if published:
+                self.stdout.write(f'Опубликовано постов: {len(published)}')
+            time.sleep(self.pause(options['interval']))
+
+    @staticmethod
+    def pause(interval):
+        """Сон до ближайшей публикации, но не дольше interval."""
+        next_pub_date = next_publication()
+        if next_pub_date is None:
+            return interval
+        seconds = (next_pub_date - timezone.now()).total_seconds()
+        return min(max(seconds, 0), interval)
@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.benchmarks import (
+    blog_clients, blog_requests, clear_caches, seed, temporary_database
+)
+from blog.models import Comment
+from blogicum.metrics import registry, render_prometheus
+
+
+class Command(BaseCommand):
+    help = ('Прогоняет URL блога на временной тестовой базе и печатает '
+            'запросы к базе и тайминги по view рядом с бюджетами')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument(
+            '--prometheus',
+            action='store_true',
+            help='Вывести показатели в формате Prometheus',
+        )
+
+    def handle(self, *args, **options):
+        registry.reset()
+        with temporary_database():
+            self.drive(seed(), options['repeat'])
+        snapshot = registry.snapshot()
+        if options['prometheus']:
+            self.stdout.write(render_prometheus(snapshot), ending='')
+        else:
+            self.report(snapshot)
+
+    @staticmethod
+    def drive(data, repeat):
+        """Первый проход с холодным кэшем, остальные — с прогретым."""
+        clients = blog_clients(data)
+        clear_caches()
+        for _ in range(repeat):
+            # Проход удаляет комментарий: следующий работает с другим.
+            data['comment'] = Comment.objects.filter(post=data['post']).first()
+            for (_, who, method), url, payload in blog_requests(data):
+                response = getattr(clients[who], method)(url, payload)
+                if response.status_code >= 400:
+                    raise CommandError(
+                        f'{url}: ответ {response.status_code}'
+                    )
+
+    def report(self, snapshot):
+        self.stdout.write(
+            f'{"view":<22} {"ответов":>7} {"запр.":>6} {"макс":>5} '
+            f'{"бюджет":>6} {"повт.":>5} {"SQL мс":>7} {"шабл. мс":>8} '
+            f'{"всего мс":>8}'
+        )
+        for view, stats in snapshot.items():
+            requests = stats['requests']
+            # Показатели общие для всех методов: рядом наибольший бюджет.
+            budget = max((
+                budget for (name, _), budget
+                in settings.BLOG_QUERY_BUDGETS.items() if name == view
+            ), default='—')
+            style = (
+                self.style.ERROR if stats['over_budget']
+                else self.style.SUCCESS
+            )
+            self.stdout.write(style(
+                f'{view:<22} {requests:>7} '
+                f'{stats["queries"] / requests:>6.1f} '
+                f'{stats["max_queries"]:>5} {budget:>6} '
+                f'{stats["duplicates"]:>5} '
+                f'{stats["sql_seconds"] * 1000 / requests:>7.2f} '
+                f'{stats["template_seconds"] * 1000 / requests:>8.2f} '
+                f'{stats["seconds"] * 1000 / requests:>8.2f}'
+            ))
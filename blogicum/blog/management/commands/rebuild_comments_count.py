@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.utils import rebuild_comments_count
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.comments_count по таблице комментариев'
+
+    def handle(self, *args, **options):
+        updated = rebuild_comments_count()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано постов: {updated}')
+        )
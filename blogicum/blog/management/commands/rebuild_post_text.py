@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog.utils import rebuild_post_text
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает Post.excerpt и Post.text_html по тексту постов'
+
+    def handle(self, *args, **options):
+        updated = rebuild_post_text()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано постов: {updated}')
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.search import has_search_index, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс постов (SQLite FTS5)'
+
+    def handle(self, *args, **options):
+        if not has_search_index():
+            raise CommandError('Полнотекстовый индекс есть только в SQLite')
+        indexed = rebuild_search_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано постов: {indexed}')
+        )
@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.jobs import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Воркер очереди фоновых задач'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Выполнить готовые задачи и выйти',
+        )
+        parser.add_argument('--batch', type=int, default=10)
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=1.0,
+            help='Пауза в секундах, когда очередь пуста',
+        )
+        parser.add_argument(
+            '--visibility-timeout',
+            type=int,
+            default=settings.BLOG_JOBS_VISIBILITY_TIMEOUT,
+            help='Через сколько секунд взятая задача снова видна другим',
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            done = run_pending(
+                options['batch'], options['visibility_timeout']
+            )
+            total += done
+            if options['once'] and not done:
+                break
+            if not done:
+                time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f'Выполнено задач: {total}'))
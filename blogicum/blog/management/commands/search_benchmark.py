@@ -0,0 +1,103 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+from faker import Faker
+
+from blog.benchmarks import temporary_database
+from blog.models import Category, Post
+from blog.publishing import publish_due_posts
+from blog.search import has_search_index, search_posts
+from blog.utils import get_posts
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает поиск через FTS5 с наивным icontains (LIKE) '
+            'на временной тестовой базе')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=5000)
+        parser.add_argument('--queries', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        if not has_search_index():
+            raise CommandError('Бенчмарк рассчитан на SQLite FTS5')
+        with temporary_database():
+            vocabulary = self.seed(options['posts'], options['seed'])
+            rng = random.Random(options['seed'])
+            results = []
+            for kind, words in vocabulary.items():
+                queries = [
+                    rng.choice(words) for _ in range(options['queries'])
+                ]
+                results.append((
+                    kind,
+                    self.measure(search_posts, queries),
+                    self.measure(self.like_search, queries),
+                ))
+        self.stdout.write(
+            f'Постов: {options["posts"]}, '
+            f'запросов каждого вида: {options["queries"]}'
+        )
+        for kind, fts, like in results:
+            self.stdout.write(
+                f'{kind:>8}: FTS5 {fts * 1000 / options["queries"]:.2f} мс, '
+                f'LIKE {like * 1000 / options["queries"]:.2f} мс, '
+                f'ускорение {like / fts:.1f}x'
+            )
+
+    @staticmethod
+    def like_search(text):
+        condition = Q()
+        for word in text.split():
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return get_posts().filter(condition)
+
+    @staticmethod
+    def measure(search, queries):
+        started = time.perf_counter()
+        for query in queries:
+            list(search(query)[:10])
+        return time.perf_counter() - started
+
+    @staticmethod
+    def seed(posts, seed):
+        """Посты из частых слов Faker и редких фамилий и городов."""
+        fake = Faker('ru_RU')
+        Faker.seed(seed)
+        rare = list({fake.last_name() for _ in range(posts)})
+        author = User.objects.create(username='benchmark')
+        category = Category.objects.create(
+            title='Бенчмарк', description='', slug='benchmark'
+        )
+        pub_date = timezone.now() - timezone.timedelta(days=1)
+        Post.objects.bulk_create(
+            (
+                Post(
+                    title=fake.sentence(nb_words=5),
+                    text=' '.join((
+                        fake.text(max_nb_chars=2000),
+                        fake.random_element(rare),
+                        fake.city_name(),
+                    )),
+                    pub_date=pub_date,
+                    author=author,
+                    category=category,
+                )
+                for _ in range(posts)
+            ),
+            batch_size=500,
+        )
+        publish_due_posts()
+        return {
+            'частые': fake.words(nb=100, unique=True),
+            'редкие': rare,
+            'нет': [f'{word}щъ' for word in fake.words(nb=100, unique=True)],
+        }
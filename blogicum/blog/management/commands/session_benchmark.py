@@ -0,0 +1,83 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog.benchmarks import clear_caches, seed, temporary_database
+
+
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+CACHED_BACKEND = 'blog.backends.CachedModelBackend'
+
+# Название, SESSION_ENGINE, бэкенд авторизации; None — аноним.
+SCENARIOS = (
+    ('аноним', None, None),
+    ('db', 'django.contrib.sessions.backends.db', MODEL_BACKEND),
+    ('cached_db', 'django.contrib.sessions.backends.cached_db',
+     MODEL_BACKEND),
+    ('cached_db + кэш', 'django.contrib.sessions.backends.cached_db',
+     CACHED_BACKEND),
+    ('signed_cookies + кэш',
+     'django.contrib.sessions.backends.signed_cookies', CACHED_BACKEND),
+)
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает запросы к базе и время ответа blog:index '
+            'для вариантов сессий и загрузки пользователя')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--warmup', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            author = seed()['author']
+            results = [
+                (name, self.measure(engine, backend, author, options))
+                for name, engine, backend in SCENARIOS
+            ]
+        baseline = results[1][1][0]
+        self.stdout.write(
+            f'{"":<22} {"запр.":>6} {"мс":>7} {"экономия запр.":>15}'
+        )
+        for name, (queries, seconds) in results:
+            self.stdout.write(
+                f'{name:<22} {queries:>6.2f} {seconds * 1000:>7.2f} '
+                f'{baseline - queries:>15.2f}'
+            )
+
+    @staticmethod
+    def measure(engine, backend, author, options):
+        """Среднее число запросов и время ответа на один запрос."""
+        settings = {}
+        if engine is not None:
+            settings = {
+                'SESSION_ENGINE': engine,
+                'AUTHENTICATION_BACKENDS': [backend],
+            }
+        with override_settings(**settings):
+            clear_caches()
+            client = Client()
+            if engine is not None:
+                client.force_login(author, backend=backend)
+            url = reverse('blog:index')
+            queries = seconds = 0
+            for number in range(options['warmup'] + options['requests']):
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    elapsed = time.perf_counter() - started
+                if response.status_code != 200:
+                    raise CommandError(f'{url}: ответ {response.status_code}')
+                if response.wsgi_request.user.is_authenticated != (
+                    engine is not None
+                ):
+                    raise CommandError(f'{engine}: сессия не загрузилась')
+                if number >= options['warmup']:
+                    queries += len(captured)
+                    seconds += elapsed
+        return queries / options['requests'], seconds / options['requests']
@@ -0,0 +1,40 @@
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from blogicum.sqlite.stress import CONFIGS, run_stress
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочная проверка SQLite: параллельные читатели ленты и '
+            'писатели комментариев на стандартном бэкенде и blogicum.sqlite')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=5.0)
+        parser.add_argument(
+            '--config',
+            choices=sorted(CONFIGS),
+            action='append',
+            help='Какие конфигурации сравнивать (по умолчанию все)',
+        )
+
+    def handle(self, *args, **options):
+        seconds = options['seconds']
+        results = {}
+        with tempfile.TemporaryDirectory() as directory:
+            for name in options['config'] or sorted(CONFIGS):
+                results[name] = run_stress(
+                    name, Path(directory) / f'{name}.sqlite3',
+                    options['readers'], options['writers'], seconds,
+                )
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:>6}: чтений {result["reads"]:>7} '
+                f'({result["reads"] / seconds:.0f}/с), '
+                f'записей {result["writes"]:>6} '
+                f'({result["writes"] / seconds:.0f}/с), '
+                f'ошибок блокировки {result["errors"]}'
+            )
@@ -0,0 +1,86 @@
+import copy
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test import RequestFactory, override_settings
+
+from blog.benchmarks import seed, temporary_database
+from blog.cache import POST_CARD_TEMPLATE, render_cards
+from blog.lookups import attach_lookups
+from blog.utils import get_posts
+from blogicum.templates import warm_up_templates
+
+
+PAGE_SIZE = 10
+
+
+def render_cards_separately(posts):
+    """Прежний рендеринг: отдельный render_to_string на каждую карточку."""
+    return [
+        render_to_string(POST_CARD_TEMPLATE, {'post': post}) for post in posts
+    ]
+
+
+def templates_setting(cached):
+    templates = copy.deepcopy(settings.TEMPLATES)
+    loaders = settings.TEMPLATE_LOADERS
+    templates[0]['OPTIONS']['loaders'] = (
+        [('django.template.loaders.cached.Loader', loaders)]
+        if cached else loaders
+    )
+    return templates
+
+
+# Название, кэширующий загрузчик, рендеринг карточек.
+SCENARIOS = (
+    ('без кэша, карточки по одной', False, render_cards_separately),
+    ('без кэша, одна пачка', False, render_cards),
+    ('кэш, карточки по одной', True, render_cards_separately),
+    ('кэш, одна пачка', True, render_cards),
+)
+
+
+class Command(BaseCommand):
+    help = ('Время рендеринга страницы ленты из 10 карточек с обычным '
+            'и кэширующим загрузчиком шаблонов')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            seed()
+            posts = attach_lookups(list(get_posts()[:PAGE_SIZE]))
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        results = []
+        for name, cached, render in SCENARIOS:
+            with override_settings(
+                TEMPLATES=templates_setting(cached),
+                BLOG_TEMPLATE_CACHE=cached,
+            ):
+                warm_up_templates()
+                results.append((
+                    name,
+                    self.measure(render, posts, request, options['pages']),
+                ))
+        baseline = results[0][1]
+        for name, seconds in results:
+            self.stdout.write(
+                f'{name:<30} {seconds * 1000:>7.2f} мс на страницу, '
+                f'быстрее в {baseline / seconds:.1f} раза'
+            )
+
+    @staticmethod
+    def measure(render, posts, request, pages):
+        started = time.perf_counter()
+        for _ in range(pages):
+            render_to_string(
+                'blog/index.html',
+                {'post_cards': render(posts), 'page_obj': None},
+                request,
+            )
+        return (time.perf_counter() - started) / pages
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Ширины готовых копий изображения', verbose_name='Уменьшенные копии фото'),
+        ),
+    ]
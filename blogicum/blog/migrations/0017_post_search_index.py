@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-17 03:48
+
+from django.db import migrations
+
+
+# Триггеры и наполнение индекса ставит обработчик post_migrate
+# blog.search.create_search_triggers: SQLite теряет триггеры, когда
+# следующие миграции пересоздают blog_post.
+CREATE_SQL = [
+    """
+    CREATE VIRTUAL TABLE blog_post_search USING fts5(
+        title, text, category, location,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+DROP_SQL = [
+    'DROP TRIGGER IF EXISTS blog_location_search_update',
+    'DROP TRIGGER IF EXISTS blog_category_search_update',
+    'DROP TRIGGER IF EXISTS blog_post_search_delete',
+    'DROP TRIGGER IF EXISTS blog_post_search_update',
+    'DROP TRIGGER IF EXISTS blog_post_search_insert',
+    'DROP TABLE IF EXISTS blog_post_search',
+]
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite(CREATE_SQL), run_sqlite(DROP_SQL)),
+    ]
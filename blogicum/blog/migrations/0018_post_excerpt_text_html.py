@@ -0,0 +1,41 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:05
+
+from django.db import migrations, models
+from django.template.defaultfilters import linebreaksbr, truncatewords
+
+
+
+def fill_post_text(apps, schema_editor):
+    # Как blog.text на момент миграции: анонс в 10 слов и linebreaksbr.
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.using(schema_editor.connection.alias)
+    batch = []
+    for post in posts.only('id', 'text').iterator(chunk_size=500):
+        post.excerpt = truncatewords(post.text, 10)
+        post.text_html = str(linebreaksbr(post.text, autoescape=True))
+        batch.append(post)
+        if len(batch) == 500:
+            posts.bulk_update(batch, ['excerpt', 'text_html'])
+            batch = []
+    posts.bulk_update(batch, ['excerpt', 'text_html'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, help_text='Начало текста для карточки, обновляется при сохранении', verbose_name='Анонс'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, help_text='Готовый HTML текста, обновляется при сохранении', verbose_name='Текст в HTML'),
+        ),
+        migrations.RunPython(fill_post_text, migrations.RunPython.noop),
+    ]
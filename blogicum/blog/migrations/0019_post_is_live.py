@@ -0,0 +1,42 @@
+# Generated by Django 3.2.16 on 2026-10-17 04:08
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+
+def fill_is_live(apps, schema_editor):
+    alias = schema_editor.connection.alias
+    posts = apps.get_model('blog', 'Post').objects.using(alias)
+    Job = apps.get_model('blog', 'Job')
+    now = timezone.now()
+    posts.filter(is_published=True, pub_date__lte=now).update(is_live=True)
+    # Задача опубликует наступившие посты и запланирует следующие.
+    if posts.filter(is_published=True, pub_date__gt=now).exists():
+        Job.objects.using(alias).create(
+            name='blog.tasks.publish_scheduled_posts', payload={}
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_post_excerpt_text_html'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_published_feed_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_live',
+            field=models.BooleanField(default=False, editable=False, help_text='Опубликован и время публикации наступило; ставится при сохранении или планировщиком.', verbose_name='Показывается в лентах'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_live', True)), fields=['-pub_date', '-id'], name='post_live_feed_idx'),
+        ),
+        migrations.RunPython(fill_is_live, migrations.RunPython.noop),
+    ]
@@ -1,19 +1,50 @@
 from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import Http404
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
 
+from .cache import (
+    build_etag, get_cached_page, page_cache_key, render_post_cards,
+    store_page
+)
 from .models import Post, Comment
 from .forms import PostForm, CommentForm
+from .lookups import attach_lookups
+from .paginators import CursorPaginator, InvalidCursor
 
 
-class OnlyAuthorMixin(UserPassesTestMixin):
+class CachedObjectMixin:
+    """Объект загружается одним запросом и переиспользуется.
+
+    Проверка прав, форма и контекст получают один и тот же объект
+    из get_object(); связанные объекты из object_select_related
+    подтягиваются тем же запросом.
+    """
+
+    object_select_related = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.object_select_related:
+            queryset = queryset.select_related(*self.object_select_related)
+        return queryset
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_cached_object'):
+            self._cached_object = super().get_object()
+        return self._cached_object
+
+
+class OnlyAuthorMixin(CachedObjectMixin, UserPassesTestMixin):
 
     def handle_no_permission(self):
         return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
 
     def test_func(self):
-        object = self.get_object()
-        return object.author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
 
 class PostEditMixin(OnlyAuthorMixin):
@@ -21,6 +52,7 @@ class PostEditMixin(OnlyAuthorMixin):
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
     form_class = PostForm
+    object_select_related = ('location',)
 
 
 class CommentEditMixin(OnlyAuthorMixin):
@@ -34,3 +66,100 @@ class CommentEditMixin(OnlyAuthorMixin):
             'blog:post_detail',
             kwargs={'post_id': self.kwargs['post_id']}
         )
+
+
+class CursorPaginationMixin:
+    """Курсорная пагинация списка постов.
+
+    Страницы листаются по курсору ?cursor= без OFFSET и COUNT(*).
+    Старые ссылки вида ?page= обслуживаются обычным пагинатором
+    с сокращённой полосой номеров страниц.
+    """
+
+    cursor_kwarg = 'cursor'
+    cursor_ordering = ('-pub_date', '-id')
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidCursor:
+            raise Http404('Некорректный курсор')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if page is not None and hasattr(page, 'number'):
+            context['elided_page_range'] = (
+                page.paginator.get_elided_page_range(page.number)
+            )
+        return context
+
+
+class PostCardsMixin:
+    """Добавляет в контекст готовый HTML карточек постов страницы.
+
+    Категории и места карточек берутся из справочников процесса.
+    """
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['post_cards'] = render_post_cards(
+            attach_lookups(list(context['object_list']))
+        )
+        return context
+
+
+class AnonymousPageCacheMixin:
+    """Кэш целых страниц для анонимных посетителей.
+
+    Ключ строится из пути с параметрами и версий областей из
+    get_cache_scopes(), которые сдвигаются сигналами моделей
+    и публикацией отложенных постов.
+    """
+
+    def get_cache_scopes(self):
+        return ()
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(request, self.get_cache_scopes())
+        response = get_cached_page(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(
+                lambda rendered: store_page(key, rendered)
+            )
+        return response
+
+
+class ConditionalGetMixin:
+    """ETag для условного GET.
+
+    ETag строится по версиям областей из get_cache_scopes() без
+    запросов к базе. Если клиент прислал совпадающий ETag, ответ 304
+    отдаётся без рендеринга. Last-Modified не отдаётся: с точностью
+    до секунды он пропустил бы правку, сделанную в ту же секунду.
+    """
+
+    def get_cache_scopes(self):
+        return ()
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        etag = build_etag(request, self.get_cache_scopes())
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            response['ETag'] = etag
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200:
+            response['ETag'] = etag
+        return response
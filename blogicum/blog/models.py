@@ -1,6 +1,10 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.urls import reverse
+from django.utils import timezone
+
+from .images import IMAGE_WIDTHS, variant_urls
+from .text import make_excerpt, render_text_html
 
 
 User = get_user_model()
@@ -66,22 +70,111 @@ class Post(PublishedAndCreatTimeModel):
         upload_to='posts_images',
         blank=True
     )
+    image_variants = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name='Уменьшенные копии фото',
+        help_text='Ширины готовых копий изображения'
+    )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+        help_text='Обновляется при добавлении и удалении комментариев'
+    )
+    is_live = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Показывается в лентах',
+        help_text=('Опубликован и время публикации наступило;'
+                   ' ставится при сохранении или планировщиком.')
+    )
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Анонс',
+        help_text='Начало текста для карточки, обновляется при сохранении'
+    )
+    text_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name='Текст в HTML',
+        help_text='Готовый HTML текста, обновляется при сохранении'
+    )
 
     class Meta:
         ordering = ['-pub_date']
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                condition=models.Q(is_live=True),
+                name='post_live_feed_idx',
+            ),
+            models.Index(
+                fields=['category', '-pub_date', '-id'],
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_feed_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.title} - {self.created_at}'
 
-    @property
-    def comment_count(self):
-        return self.comments.count()
-
     def get_absolute_url(self):
         return reverse('blog:index')
 
+    # Поля, которые пересчитываются из исходных в pre_save
+    # (signals.update_post_derived_fields), в том числе при
+    # raw-сохранениях loaddata.
+    DERIVED_FIELDS = {
+        'text': ('excerpt', 'text_html'),
+        'is_published': ('is_live',),
+        'pub_date': ('is_live',),
+    }
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *update_fields,
+                *(
+                    derived for field in update_fields
+                    for derived in self.DERIVED_FIELDS.get(field, ())
+                ),
+            }
+        super().save(*args, **kwargs)
+
+    def update_is_live(self):
+        """Показывать ли пост в лентах на текущий момент."""
+        self.is_live = self.is_published and self.pub_date <= timezone.now()
+
+    def render_text(self):
+        """Анонс и HTML из text: шаблоны не обрабатывают текст заново."""
+        self.excerpt = make_excerpt(self.text)
+        self.text_html = render_text_html(self.text)
+
+    @property
+    def image_srcset(self):
+        return ', '.join(
+            f'{url} {width}w'
+            for width, url in variant_urls(self.image, self.image_variants)
+        )
+
+    @property
+    def image_preview_url(self):
+        """Копия для карточки; оригинал открывается по клику"""
+        variants = [
+            url for width, url in variant_urls(self.image, self.image_variants)
+            if width <= IMAGE_WIDTHS[-1]
+        ]
+        return variants[-1] if variants else self.image.url
+
 
 class Category(PublishedAndCreatTimeModel):
     title = models.CharField(
@@ -151,6 +244,79 @@ class Comment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['post', 'created_at', 'id'],
+                name='comment_post_created_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.author.username} - {self.text}'
+
+
+class Job(models.Model):
+    """Фоновая задача, которую выполняет воркер run_jobs"""
+
+    QUEUED = 'queued'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'В очереди'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        max_length=128,
+        verbose_name='Задача'
+    )
+    payload = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Аргументы'
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=QUEUED,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=5,
+        verbose_name='Максимум попыток'
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Выполнить после'
+    )
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Занята воркером до',
+        help_text='После этого времени задачу может взять другой воркер'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+
+    class Meta:
+        ordering = ['run_after']
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        indexes = [
+            models.Index(
+                fields=['status', 'run_after'],
+                name='job_queue_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.status}, попыток: {self.attempts})'
@@ -0,0 +1,174 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils import timezone
+
+
+# Целые значения курсора должны помещаться в 64-битное целое базы.
+MAX_INTEGER = 2 ** 63 - 1
+
+
+class InvalidCursor(InvalidPage):
+    """Курсор не удалось разобрать"""
+
+
+class CursorPage:
+    """Страница курсорной пагинации"""
+
+    def __init__(self, object_list, paginator, next_cursor=None,
+                 previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Пагинация по ключу (keyset) без OFFSET и COUNT(*).
+
+    Позиция на странице задаётся непрозрачным курсором со значениями
+    полей сортировки последнего (или первого) объекта. Последнее поле
+    в ordering должно быть уникальным, например id.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = tuple(field.lstrip('-') for field in self.ordering)
+
+    def page(self, cursor=None):
+        if not cursor:
+            return self._forward_page(None)
+        values, backwards = self.decode_cursor(cursor)
+        if backwards:
+            return self._backward_page(values)
+        return self._forward_page(values)
+
+    def _forward_page(self, values):
+        queryset = self.queryset.order_by(*self.ordering)
+        if values is not None:
+            queryset = self._filter_after(queryset, values, self.ordering)
+        rows = list(queryset[:self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        next_cursor = previous_cursor = None
+        if has_next:
+            next_cursor = self.encode_cursor(rows[-1])
+        if values is not None and rows:
+            previous_cursor = self.encode_cursor(rows[0], backwards=True)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+    def _backward_page(self, values):
+        ordering = tuple(self._reverse(field) for field in self.ordering)
+        queryset = self._filter_after(
+            self.queryset.order_by(*ordering), values, ordering
+        )
+        rows = list(queryset[:self.per_page + 1])
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+        next_cursor = previous_cursor = None
+        if rows:
+            next_cursor = self.encode_cursor(rows[-1])
+            if has_previous:
+                previous_cursor = self.encode_cursor(rows[0], backwards=True)
+        return CursorPage(rows, self, next_cursor, previous_cursor)
+
+    def _filter_after(self, queryset, values, ordering):
+        try:
+            return queryset.filter(self._seek(values, ordering))
+        except (ValidationError, ValueError, TypeError):
+            raise InvalidCursor('Некорректный курсор')
+
+    def _seek(self, values, ordering):
+        """Условие «строго после values» для заданного порядка."""
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            step = Q(**{f'{name}__{lookup}': values[index]})
+            for previous, value in zip(self.fields[:index], values):
+                step &= Q(**{previous: value})
+            condition |= step
+        return condition
+
+    @staticmethod
+    def _reverse(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def _position(self, obj):
+        position = []
+        for field in self.fields:
+            value = (
+                obj[field] if isinstance(obj, dict) else getattr(obj, field)
+            )
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def encode_cursor(self, obj, backwards=False):
+        payload = json.dumps(
+            {'p': self._position(obj), 'b': int(backwards)},
+            separators=(',', ':'),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = payload['p']
+            backwards = bool(payload.get('b'))
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise InvalidCursor('Некорректный курсор')
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor('Некорректный курсор')
+        return [
+            self._coerce(field, value)
+            for field, value in zip(self.fields, values)
+        ], backwards
+
+    def _coerce(self, name, value):
+        """Значение курсора в типе поля модели; иначе InvalidCursor."""
+        if value is None or isinstance(value, (bool, dict, list)):
+            raise InvalidCursor('Некорректный курсор')
+        try:
+            field = self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        try:
+            value = field.to_python(value)
+        except (ValidationError, ValueError, TypeError):
+            raise InvalidCursor('Некорректный курсор')
+        if isinstance(value, int) and abs(value) > MAX_INTEGER:
+            raise InvalidCursor('Некорректный курсор')
+        if isinstance(value, datetime) and timezone.is_naive(value):
+            raise InvalidCursor('Некорректный курсор')
+        return value
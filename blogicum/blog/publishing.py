@@ -0,0 +1,45 @@
+"""Отложенные публикации.
+
+Ленты показывают посты с is_live. Флаг ставится при сохранении, если
+pub_date уже наступила. Будущие посты делает видимыми задача
+publish_scheduled_posts: она стоит в очереди (blog.jobs) на ближайшую
+pub_date и после запуска планирует себя на следующую. Команда
+publish_scheduled делает то же без воркера очереди.
+
+О каждой пачке опубликованных постов сообщает сигнал posts_published;
+его обработчик сдвигает версии кэша страниц.
+"""
+from django.db.models import Min
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Post
+
+
+# Аргумент posts — список словарей с id, category_id и author_id.
+posts_published = Signal()
+
+
+def pending_posts():
+    """Опубликованные посты, которые ещё не показываются в лентах."""
+    return Post.objects.filter(is_published=True, is_live=False)
+
+
+def next_publication():
+    """Ближайшая pub_date среди ожидающих постов или None."""
+    return pending_posts().aggregate(next=Min('pub_date'))['next']
+
+
+def publish_due_posts(now=None):
+    """Показывает в лентах посты с наступившей pub_date."""
+    posts = list(
+        pending_posts().filter(
+            pub_date__lte=now or timezone.now()
+        ).values('id', 'category_id', 'author_id')
+    )
+    if posts:
+        Post.objects.filter(
+            pk__in=[post['id'] for post in posts], is_live=False
+        ).update(is_live=True)
+        posts_published.send(sender=Post, posts=posts)
+    return posts
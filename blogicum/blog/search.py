@@ -0,0 +1,200 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.models import Q
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .utils import get_posts
+
+
+SEARCH_TABLE = 'blog_post_search'
+# Веса bm25 для колонок title, text, category, location.
+RANK = f'bm25({SEARCH_TABLE}, 10.0, 1.0, 4.0, 4.0)'
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+SNIPPET = (
+    f"snippet({SEARCH_TABLE}, 1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}',"
+    " '…', 16)"
+)
+INDEX_ROW = """
+    SELECT {post}.id, {post}.title, {post}.text,
+           (SELECT title FROM blog_category
+            WHERE blog_category.id = {post}.category_id),
+           (SELECT name FROM blog_location
+            WHERE blog_location.id = {post}.location_id)
+"""
+# Триггеры синхронизации индекса. SQLite удаляет триггеры вместе с
+# таблицей, а Django при AddField и AlterField пересоздаёт blog_post,
+# причём триггер категорий не даёт переименовать новую таблицу. Поэтому
+# триггеры не живут в миграциях: drop_search_triggers снимает их перед
+# миграциями блога (pre_migrate), create_search_triggers ставит
+# недостающие после migrate (post_migrate).
+SEARCH_TRIGGERS = {
+    'blog_post_search_insert': f"""
+    CREATE TRIGGER blog_post_search_insert AFTER INSERT ON blog_post
+    BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, text, category, location)
+        {INDEX_ROW.format(post='new')};
+    END
+    """,
+    'blog_post_search_update': f"""
+    CREATE TRIGGER blog_post_search_update
+    AFTER UPDATE OF title, text, category_id, location_id ON blog_post
+    BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+        INSERT INTO {SEARCH_TABLE}(rowid, title, text, category, location)
+        {INDEX_ROW.format(post='new')};
+    END
+    """,
+    'blog_post_search_delete': f"""
+    CREATE TRIGGER blog_post_search_delete AFTER DELETE ON blog_post
+    BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    'blog_category_search_update': f"""
+    CREATE TRIGGER blog_category_search_update
+    AFTER UPDATE OF title ON blog_category
+    BEGIN
+        UPDATE {SEARCH_TABLE} SET category = new.title
+        WHERE rowid IN (
+            SELECT id FROM blog_post WHERE category_id = new.id
+        );
+    END
+    """,
+    'blog_location_search_update': f"""
+    CREATE TRIGGER blog_location_search_update
+    AFTER UPDATE OF name ON blog_location
+    BEGIN
+        UPDATE {SEARCH_TABLE} SET location = new.name
+        WHERE rowid IN (
+            SELECT id FROM blog_post WHERE location_id = new.id
+        );
+    END
+    """,
+}
+REBUILD_SQL = (
+    f'DELETE FROM {SEARCH_TABLE}',
+    f"""
+    INSERT INTO {SEARCH_TABLE}(rowid, title, text, category, location)
+    {INDEX_ROW.format(post='blog_post')} FROM blog_post
+    """,
+)
+
+
+def has_search_index():
+    return connection.vendor == 'sqlite'
+
+
+def fts_query(text):
+    """Поисковая строка FTS5: все слова запроса, последнее — префиксом."""
+    words = re.findall(r'\w+', text.lower())
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words[:-1]]
+    terms.append(f'"{words[-1]}"*')
+    return ' '.join(terms)
+
+
+def search_posts(text):
+    """Опубликованные посты по запросу, от самых релевантных.
+
+    Видимость та же, что у get_posts(). Без SQLite поиск идёт через
+    icontains по заголовку и тексту.
+    """
+    query = fts_query(text)
+    if not query:
+        return get_posts().none()
+    if not has_search_index():
+        words = re.findall(r'\w+', text)
+        condition = Q()
+        for word in words:
+            condition &= Q(title__icontains=word) | Q(text__icontains=word)
+        return get_posts().filter(condition)
+    return get_posts().extra(
+        tables=[SEARCH_TABLE],
+        where=[
+            f'{SEARCH_TABLE}.rowid = blog_post.id',
+            f'{SEARCH_TABLE} MATCH %s',
+        ],
+        params=[query],
+        select={'rank': RANK},
+    ).order_by('rank', '-pub_date')
+
+
+def add_snippets(posts, text):
+    """Фрагменты текста с подсветкой только для показываемых постов."""
+    posts = list(posts)
+    snippets = {}
+    query = fts_query(text)
+    if posts and query and has_search_index():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, {SNIPPET} FROM {SEARCH_TABLE} '
+                f'WHERE {SEARCH_TABLE} MATCH %s AND rowid IN ('
+                + ', '.join(['%s'] * len(posts)) + ')',
+                [query, *(post.pk for post in posts)],
+            )
+            snippets = dict(cursor.fetchall())
+    for post in posts:
+        post.highlighted = highlight(snippets.get(post.pk, ''))
+    return posts
+
+
+def highlight(snippet):
+    """HTML фрагмента с найденными словами в <mark>."""
+    return mark_safe(
+        escape(snippet)
+        .replace(HIGHLIGHT_START, '<mark>')
+        .replace(HIGHLIGHT_END, '</mark>')
+    )
+
+
+def rebuild_search_index(using=DEFAULT_DB_ALIAS):
+    with connections[using].cursor() as cursor:
+        for statement in REBUILD_SQL:
+            cursor.execute(statement)
+        cursor.execute(f'SELECT count(*) FROM {SEARCH_TABLE}')
+        return cursor.fetchone()[0]
+
+
+def has_search_table(connection):
+    return (
+        connection.vendor == 'sqlite'
+        and SEARCH_TABLE in connection.introspection.table_names()
+    )
+
+
+def drop_search_triggers(using, plan=None, **kwargs):
+    """Обработчик pre_migrate: снимает триггеры перед миграциями блога."""
+    connection = connections[using]
+    if not any(
+        migration.app_label == 'blog' for migration, backwards in plan or ()
+    ) or not has_search_table(connection):
+        return
+    with connection.cursor() as cursor:
+        for name in SEARCH_TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+
+
+def create_search_triggers(using, **kwargs):
+    """Обработчик post_migrate: ставит недостающие триггеры.
+
+    Пока триггеров не было, индекс мог отстать от постов, поэтому
+    после их установки он перестраивается.
+    """
+    connection = connections[using]
+    if not has_search_table(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        existing = {name for name, in cursor.fetchall()}
+        missing = [
+            sql for name, sql in SEARCH_TRIGGERS.items()
+            if name not in existing
+        ]
+        for sql in missing:
+            cursor.execute(sql)
+    if missing:
+        rebuild_search_index(using)
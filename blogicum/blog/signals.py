@@ -0,0 +1,246 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+
+from blogicum.db_routers import use_primary
+
+from .cache import (
+    FEED_SCOPE, LOOKUPS_SCOPE, PAGES_SCOPE, SYNDICATION_SCOPE,
+    author_syndication_scope, category_feed_scope,
+    category_syndication_scope
+)
+from .lookups import refresh_lookups
+from .models import Category, Comment, Location, Post
+from .publishing import posts_published
+from .tasks import (
+    bump_versions_after_write, delete_image_derivatives, process_post_image,
+    schedule_publication
+)
+
+
+User = get_user_model()
+
+# Поля пользователя, которые видны на страницах: имя в карточках и
+# комментариях, полное имя и отметка персонала в профиле.
+USER_PAGE_FIELDS = ('username', 'first_name', 'last_name', 'is_staff')
+
+
+class PendingBump:
+    """Сдвиг версий после commit: одна пачка областей на транзакцию."""
+
+    def __init__(self):
+        self.scopes = set()
+        # Удаляемые посты: их комментарии уходят каскадом, а области
+        # поста сдвигает post_changed.
+        self.deleted_posts = set()
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        if self.scopes:
+            bump_versions_after_write(*self.scopes)
+
+
+def pending_bump():
+    """Отложенный сдвиг текущей транзакции; вне транзакции — None."""
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+    for _, callback in connection.run_on_commit:
+        if isinstance(callback, PendingBump) and not callback.done:
+            return callback
+    callback = PendingBump()
+    transaction.on_commit(callback)
+    return callback
+
+
+def bump_on_commit(*scopes):
+    pending = pending_bump()
+    if pending is None:
+        bump_versions_after_write(*scopes)
+    else:
+        pending.scopes.update(scopes)
+
+
+def category_feed_scopes(*category_ids):
+    """Области страниц и лент подписки категорий, где показываются посты."""
+    slugs = Category.objects.filter(
+        pk__in=[pk for pk in category_ids if pk is not None]
+    ).values_list('slug', flat=True)
+    return [
+        scope for slug in slugs for scope in (
+            category_feed_scope(slug), category_syndication_scope(slug)
+        )
+    ]
+
+
+def author_syndication_scopes(*author_ids):
+    usernames = User.objects.filter(pk__in=author_ids).values_list(
+        'username', flat=True
+    )
+    return [author_syndication_scope(username) for username in usernames]
+
+
+@receiver(pre_save, sender=Post)
+@use_primary()
+def remember_previous_post(sender, instance, **kwargs):
+    previous = Post.objects.filter(pk=instance.pk).values_list(
+        'category_id', 'image', 'image_variants'
+    ).first() if instance.pk else None
+    (
+        instance._previous_category_id, previous_image, previous_variants
+    ) = previous or (None, '', [])
+    instance._image_changed = (
+        (instance.image.name or '') != (previous_image or '')
+    )
+    if instance._image_changed:
+        instance.image_variants = []
+        instance._previous_image = (previous_image, previous_variants)
+
+
+@receiver(post_save, sender=Post)
+def queue_post_image(sender, instance, **kwargs):
+    if not getattr(instance, '_image_changed', False):
+        return
+    previous_image, previous_variants = instance._previous_image
+    if previous_image and previous_variants:
+        delete_image_derivatives.delay(
+            image=previous_image, widths=previous_variants
+        )
+    if instance.image:
+        process_post_image.delay(post_id=instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def delete_post_image(sender, instance, **kwargs):
+    if instance.image and instance.image_variants:
+        delete_image_derivatives.delay(
+            image=instance.image.name, widths=instance.image_variants
+        )
+
+
+@receiver(pre_save, sender=Post)
+def update_post_derived_fields(
+    sender, instance, update_fields=None, **kwargs
+):
+    if update_fields is None or 'text' in update_fields:
+        instance.render_text()
+    if update_fields is None or {'is_published', 'pub_date'} & update_fields:
+        instance.update_is_live()
+
+
+@receiver(post_save, sender=Post)
+def queue_post_publication(sender, instance, **kwargs):
+    if instance.is_published and not instance.is_live:
+        transaction.on_commit(schedule_publication)
+
+
+@receiver(posts_published)
+@use_primary()
+def posts_went_live(sender, posts, **kwargs):
+    bump_on_commit(
+        FEED_SCOPE,
+        SYNDICATION_SCOPE,
+        *(f'post:{post["id"]}' for post in posts),
+        *category_feed_scopes(*{post['category_id'] for post in posts}),
+        *author_syndication_scopes(*{post['author_id'] for post in posts}),
+    )
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleted_post(sender, instance, **kwargs):
+    pending = pending_bump()
+    if pending is not None:
+        pending.deleted_posts.add(instance.pk)
+
+
+@receiver((post_save, post_delete), sender=Post)
+@use_primary()
+def post_changed(sender, instance, **kwargs):
+    bump_on_commit(
+        f'post:{instance.pk}',
+        FEED_SCOPE,
+        SYNDICATION_SCOPE,
+        *category_feed_scopes(
+            instance.category_id,
+            getattr(instance, '_previous_category_id', None),
+        ),
+        *author_syndication_scopes(instance.author_id),
+    )
+
+
+@receiver((post_save, post_delete), sender=Category)
+def category_changed(sender, instance, **kwargs):
+    bump_on_commit(f'category:{instance.pk}', LOOKUPS_SCOPE, PAGES_SCOPE)
+    transaction.on_commit(refresh_lookups)
+
+
+@receiver((post_save, post_delete), sender=Location)
+def location_changed(sender, instance, **kwargs):
+    bump_on_commit(f'location:{instance.pk}', LOOKUPS_SCOPE, PAGES_SCOPE)
+    transaction.on_commit(refresh_lookups)
+
+
+def user_page_values(user):
+    # Через __dict__: отложенное поле не должно загружаться запросом.
+    return tuple(user.__dict__.get(field) for field in USER_PAGE_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_user_page_values(sender, instance, **kwargs):
+    instance._page_values = user_page_values(instance)
+
+
+@receiver(post_save, sender=User)
+def author_changed(sender, instance, created=False, **kwargs):
+    values = user_page_values(instance)
+    # Пользователь из кэша сессий распакован без post_init.
+    if created or values == getattr(instance, '_page_values', None):
+        return
+    instance._page_values = values
+    bump_on_commit(f'user:{instance.pk}', PAGES_SCOPE)
+
+
+@receiver(post_delete, sender=User)
+def author_deleted(sender, instance, **kwargs):
+    bump_on_commit(f'user:{instance.pk}', PAGES_SCOPE)
+
+
+@receiver(post_save, sender=Comment)
+def comment_added(sender, instance, created=False, raw=False, using=None,
+                  **kwargs):
+    # В фикстуре счётчик поста уже учитывает её комментарии.
+    if created and not raw:
+        Post.objects.using(using).filter(pk=instance.post_id).update(
+            comments_count=F('comments_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_removed(sender, instance, using=None, **kwargs):
+    pending = pending_bump()
+    if pending is not None and instance.post_id in pending.deleted_posts:
+        return
+    Post.objects.using(using).filter(
+        pk=instance.post_id, comments_count__gt=0
+    ).update(comments_count=F('comments_count') - 1)
+
+
+@receiver((post_save, post_delete), sender=Comment)
+@use_primary()
+def comment_changed(sender, instance, **kwargs):
+    pending = pending_bump()
+    if pending is not None and instance.post_id in pending.deleted_posts:
+        return
+    slugs = Category.objects.filter(post=instance.post_id).values_list(
+        'slug', flat=True
+    )
+    bump_on_commit(
+        f'post:{instance.post_id}',
+        FEED_SCOPE,
+        *map(category_feed_scope, slugs),
+    )
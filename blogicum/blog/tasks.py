@@ -0,0 +1,91 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Q
+from django.utils import timezone
+
+from .cache import bump_versions
+from .images import delete_derivatives
+from .jobs import job
+from .models import Job, Post
+from .publishing import next_publication, publish_due_posts
+from .utils import update_image_variants
+
+
+@job
+def process_post_image(post_id):
+    """Уменьшенные копии фото поста"""
+    post = Post.objects.filter(pk=post_id).first()
+    if post is not None and post.image:
+        update_image_variants(post)
+
+
+@job
+def delete_image_derivatives(image, widths):
+    """Удаление копий заменённого или удалённого фото"""
+    delete_derivatives(Post._meta.get_field('image').storage, image, widths)
+
+
+@job
+def bump_cache_versions(scopes):
+    """Повторный сдвиг версий после записи, когда реплики её догнали"""
+    bump_versions(*scopes)
+
+
+def bump_versions_after_write(*scopes):
+    """Сдвигает версии сейчас и ещё раз через DATABASE_REPLICA_PIN_SECONDS.
+
+    Пока реплики отстают, чтения других клиентов могут заполнить новые
+    ключи старыми строками; повторный сдвиг делает их устаревшими.
+    """
+    bump_versions(*scopes)
+    if settings.DATABASE_REPLICAS and scopes:
+        bump_cache_versions.schedule(
+            timezone.now() + timezone.timedelta(
+                seconds=settings.DATABASE_REPLICA_PIN_SECONDS
+            ),
+            scopes=sorted(scopes),
+        )
+
+
+@job
+def publish_scheduled_posts():
+    """Публикация постов, время которых наступило"""
+    publish_due_posts()
+    schedule_publication()
+
+
+def schedule_publication():
+    """Ставит publish_scheduled_posts на ближайшую отложенную публикацию.
+
+    Задача, которая выполняется сейчас, занята воркером и удаляется
+    после выполнения, поэтому следующий запуск она не заменяет.
+    """
+    run_after = next_publication()
+    if run_after is None or Job.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=timezone.now()),
+        name=publish_scheduled_posts.job_name,
+        status=Job.QUEUED,
+        run_after__lte=run_after,
+    ).exists():
+        return None
+    return publish_scheduled_posts.schedule(run_after)
+
+
+@job
+def send_email(messages):
+    """Отправка писем настоящим почтовым бэкендом"""
+    connection = get_connection(settings.BLOG_QUEUED_EMAIL_BACKEND)
+    connection.send_messages([
+        EmailMultiAlternatives(
+            subject=message['subject'],
+            body=message['body'],
+            from_email=message['from_email'],
+            to=message['to'],
+            cc=message['cc'],
+            bcc=message['bcc'],
+            reply_to=message['reply_to'],
+            headers=message['headers'],
+            alternatives=[tuple(item) for item in message['alternatives']],
+        )
+        for message in messages
+    ])
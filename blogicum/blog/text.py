@@ -0,0 +1,14 @@
+from django.template.defaultfilters import linebreaksbr, truncatewords
+
+
+EXCERPT_WORDS = 10
+
+
+def make_excerpt(text):
+    """Начало текста для карточки поста, как truncatewords:10."""
+    return truncatewords(text, EXCERPT_WORDS)
+
+
+def render_text_html(text):
+    """Текст поста в HTML, как linebreaksbr: экранирование и <br>."""
+    return str(linebreaksbr(text, autoescape=True))
@@ -1,18 +1,36 @@
+from django.conf import settings
 from django.urls import path, reverse_lazy
 
-from . import views
+from . import api, async_views, feeds, views
 
 app_name = 'blog'
 
+# Под ASGI ленты, пост и профиль обслуживают асинхронные варианты.
+if settings.BLOG_ASYNC_VIEWS:
+    post_list_view = async_views.post_list
+    category_posts_view = async_views.category_posts
+    post_detail_view = async_views.post_detail
+    profile_view = async_views.profile
+else:
+    post_list_view = views.PostListView.as_view()
+    category_posts_view = views.CategoryPostView.as_view()
+    post_detail_view = views.PostDetailView.as_view()
+    profile_view = views.ProfileDetailView.as_view()
+
 urlpatterns = [
     path(
         '',
-        views.PostListView.as_view(),
+        post_list_view,
         name='index'
     ),
+    path(
+        'search/',
+        views.SearchView.as_view(),
+        name='search'
+    ),
     path(
         'posts/<int:post_id>/',
-        views.PostDetailView.as_view(),
+        post_detail_view,
         name='post_detail'
     ),
     path(
@@ -22,7 +40,7 @@ urlpatterns = [
     ),
     path(
         'category/<slug:category_slug>/',
-        views.CategoryPostView.as_view(),
+        category_posts_view,
         name='category_posts',
     ),
     path(
@@ -52,9 +70,59 @@ urlpatterns = [
     ),
     path(
         'profile/<str:username>/',
-        views.ProfileDetailView.as_view(),
+        profile_view,
         name='profile'
     ),
+    path(
+        'api/posts/',
+        api.PostsApiView.as_view(),
+        name='api_posts'
+    ),
+    path(
+        'api/posts/<int:post_id>/comments/',
+        api.CommentsApiView.as_view(),
+        name='api_post_comments'
+    ),
+    path(
+        'api/category/<slug:category_slug>/posts/',
+        api.CategoryPostsApiView.as_view(),
+        name='api_category_posts'
+    ),
+    path(
+        'api/profile/<str:username>/posts/',
+        api.ProfilePostsApiView.as_view(),
+        name='api_profile_posts'
+    ),
+    path(
+        'rss/',
+        feeds.PostsFeed(),
+        name='posts_rss'
+    ),
+    path(
+        'atom/',
+        feeds.PostsAtomFeed(),
+        name='posts_atom'
+    ),
+    path(
+        'category/<slug:category_slug>/rss/',
+        feeds.CategoryFeed(),
+        name='category_rss'
+    ),
+    path(
+        'category/<slug:category_slug>/atom/',
+        feeds.CategoryAtomFeed(),
+        name='category_atom'
+    ),
+    path(
+        'profile/<str:username>/rss/',
+        feeds.ProfileFeed(),
+        name='profile_rss'
+    ),
+    path(
+        'profile/<str:username>/atom/',
+        feeds.ProfileAtomFeed(),
+        name='profile_atom'
+    ),
     path(
         '<int:pk>/edit/',
         views.ProfileUpdateView.as_view(
@@ -1,15 +1,55 @@
-from datetime import datetime
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
-from .models import Post
+from .bulk import iter_batches
+from .images import generate_derivatives
+from .lookups import unpublished_category_ids
+from .models import Post, Comment
 
 
 def get_posts():
-    """Получение постов"""
-    now = datetime.today()
-    return Post.objects.select_related(
-        'location', 'author', 'category'
-    ).filter(
-        is_published=True,
-        pub_date__lt=now,
-        category__is_published=True
-    ).order_by('-pub_date')
+    """Получение постов
+
+    Категории и места не присоединяются: их подставляет attach_lookups().
+    """
+    return Post.objects.select_related('author').filter(
+        is_live=True,
+        category__isnull=False
+    ).exclude(
+        category_id__in=unpublished_category_ids()
+    ).order_by('-pub_date', '-id')
+
+
+def rebuild_comments_count(posts=None):
+    """Пересчёт счётчика комментариев у постов"""
+    if posts is None:
+        posts = Post.objects.all()
+    counts = Comment.objects.filter(
+        post=OuterRef('pk')
+    ).order_by().values('post').annotate(total=Count('pk')).values('total')
+    return posts.update(comments_count=Coalesce(
+        Subquery(counts, output_field=IntegerField()), 0
+    ))
+
+
+def rebuild_post_text(posts=None, batch_size=500):
+    """Пересчёт анонсов и HTML текста постов пачками"""
+    if posts is None:
+        posts = Post.objects.all()
+    updated = 0
+    for batch in iter_batches(posts.only('id', 'text'), batch_size):
+        for post in batch:
+            post.render_text()
+        Post.objects.using(posts.db).bulk_update(
+            batch, ['excerpt', 'text_html']
+        )
+        updated += len(batch)
+    return updated
+
+
+def update_image_variants(post):
+    """Генерация уменьшенных копий фото поста"""
+    post.image_variants = (
+        generate_derivatives(post.image) if post.image else []
+    )
+    post.save(update_fields=['image_variants'])
@@ -1,34 +1,56 @@
+import copy
+
+from django.db import transaction
+from django.db.models import Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView
 )
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse_lazy, reverse
+from django.utils.functional import cached_property
 from django.contrib.auth import get_user_model
 
-from .models import Post, Category, Comment
+from .models import Post, Comment
 from .forms import PostForm, UserForm, CommentForm
+from .lookups import attach_lookups, get_published_category
+from .paginators import CursorPaginator, InvalidCursor
+from .search import add_snippets, search_posts
 from .utils import get_posts
-from .mixins import PostEditMixin, CommentEditMixin
+from .cache import FEED_SCOPE, category_feed_scope
+from .mixins import (
+    AnonymousPageCacheMixin, CommentEditMixin, ConditionalGetMixin,
+    CursorPaginationMixin, PostCardsMixin, PostEditMixin
+)
 
 
 POSTS_PER_PAGE = 10
+COMMENTS_PER_PAGE = 20
+SEARCH_RESULTS_PER_PAGE = 10
+# Карточкам хватает анонса: полный текст в ленты не загружается.
+POST_CARD_DEFERRED_FIELDS = ('text', 'text_html')
 
 User = get_user_model()
 
 
-class PostListView(ListView):
+class PostListView(ConditionalGetMixin, AnonymousPageCacheMixin,
+                   PostCardsMixin, CursorPaginationMixin, ListView):
     """Получение всех постов"""
 
     model = Post
     template_name = 'blog/index.html'
     paginate_by = POSTS_PER_PAGE
 
+    def get_cache_scopes(self):
+        return (FEED_SCOPE,)
+
     def get_queryset(self):
-        return get_posts()
+        return get_posts().defer(*POST_CARD_DEFERRED_FIELDS)
 
 
-class CategoryPostView(ListView):
+class CategoryPostView(ConditionalGetMixin, AnonymousPageCacheMixin,
+                       PostCardsMixin, CursorPaginationMixin, ListView):
     """Получение постов по категории"""
 
     model = Post
@@ -36,18 +58,24 @@ class CategoryPostView(ListView):
     slug_url_kwarg = 'category_slug'
     template_name = 'blog/category.html'
 
+    @cached_property
+    def category(self):
+        category = get_published_category(self.kwargs['category_slug'])
+        if category is None:
+            raise Http404('Категория не найдена')
+        return category
+
+    def get_cache_scopes(self):
+        return (category_feed_scope(self.kwargs['category_slug']),)
+
     def get_queryset(self):
         return get_posts().filter(
-            category__slug=self.kwargs['category_slug']
-        )
+            category=self.category
+        ).defer(*POST_CARD_DEFERRED_FIELDS)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['category'] = get_object_or_404(
-            Category,
-            slug=self.kwargs['category_slug'],
-            is_published=True
-        )
+        context['category'] = self.category
         return context
 
 
@@ -69,31 +97,38 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class PostDetailView(DetailView):
+class PostDetailView(ConditionalGetMixin, AnonymousPageCacheMixin,
+                     DetailView):
     """Просмотр поста"""
 
     model = Post
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    def get_cache_scopes(self):
+        return (f'post:{self.kwargs["post_id"]}',)
+
     def get_queryset(self):
-        post = Post.objects.filter(
-            pk=self.kwargs['post_id'],
-            is_published=True,
-        )
-        if not post and not self.request.user.is_anonymous:
-            post = Post.objects.filter(
-                pk=self.kwargs['post_id'],
-                author=self.request.user
-            )
-        return post
+        visible = Q(is_published=True)
+        if self.request.user.is_authenticated:
+            visible |= Q(author=self.request.user)
+        return Post.objects.select_related(
+            'location', 'author', 'category'
+        ).filter(visible)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (
-            Comment.objects.select_related('author', 'post')
+        paginator = CursorPaginator(
+            self.object.comments.select_related('author'),
+            COMMENTS_PER_PAGE,
+            ordering=('created_at', 'id'),
         )
+        try:
+            comments = paginator.page(self.request.GET.get('comments'))
+        except InvalidCursor:
+            raise Http404('Некорректный курсор комментариев')
+        context['comments'] = comments
         return context
 
 
@@ -114,12 +149,12 @@ class PostDeleteView(PostEditMixin, DeleteView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        post = get_object_or_404(Post, pk=self.kwargs['post_id'])
-        context['form'] = PostForm(instance=post)
+        context['form'] = PostForm(instance=self.object)
         return context
 
 
-class ProfileDetailView(ListView):
+class ProfileDetailView(ConditionalGetMixin, PostCardsMixin,
+                        CursorPaginationMixin, ListView):
     """Обзор профиля"""
 
     model = Post
@@ -127,11 +162,14 @@ class ProfileDetailView(ListView):
     template_name = 'blog/profile.html'
     user = None
 
+    def get_cache_scopes(self):
+        return (FEED_SCOPE,)
+
     def get_queryset(self):
         self.user = get_object_or_404(User, username=self.kwargs['username'])
-        return Post.objects.select_related(
-            'location', 'author', 'category'
-        ).filter(author=self.user)
+        return Post.objects.select_related('author').filter(
+            author=self.user
+        ).defer(*POST_CARD_DEFERRED_FIELDS)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -145,10 +183,16 @@ class ProfileUpdateView(UserPassesTestMixin, UpdateView):
     model = User
     template_name = 'blog/user.html'
     form_class = UserForm
+    # Не 'user': шапка берёт вошедшего пользователя из контекста.
+    context_object_name = 'profile'
 
     def test_func(self):
-        object = self.get_object()
-        return object == self.request.user
+        return self.kwargs['pk'] == self.request.user.pk
+
+    def get_object(self, queryset=None):
+        # Свой профиль: пользователь уже загружен AuthenticationMiddleware.
+        # Копия: неверная форма не должна менять request.user в шапке.
+        return copy.copy(self.request.user)
 
 
 class CommentCreateView(LoginRequiredMixin, CreateView):
@@ -166,7 +210,9 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         form.instance.post = self.post_card
         form.instance.author = self.request.user
-        return super().form_valid(form)
+        # Комментарий и счётчик поста (comment_added) меняются вместе.
+        with transaction.atomic():
+            return super().form_valid(form)
 
     def get_success_url(self):
         return reverse(
@@ -181,3 +227,34 @@ class CommentUpdateView(CommentEditMixin, UpdateView):
 
 class CommentDeleteView(CommentEditMixin, DeleteView):
     """Удаление комментария"""
+
+
+class SearchView(ListView):
+    """Полнотекстовый поиск по постам"""
+
+    template_name = 'blog/search.html'
+    paginate_by = SEARCH_RESULTS_PER_PAGE
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        return search_posts(self.query)
+
+    def paginate_queryset(self, queryset, page_size):
+        """Страницы без COUNT(*): лишняя запись показывает, что есть ещё."""
+        try:
+            page = max(int(self.request.GET.get(self.page_kwarg, 1)), 1)
+        except ValueError:
+            raise Http404('Некорректный номер страницы')
+        offset = (page - 1) * page_size
+        results = list(queryset[offset:offset + page_size + 1])
+        self.has_next = len(results) > page_size
+        self.page = page
+        posts = attach_lookups(results[:page_size])
+        return None, None, add_snippets(posts, self.query), False
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['page'] = self.page
+        context['has_next'] = self.has_next
+        return context
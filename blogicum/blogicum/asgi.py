@@ -11,6 +11,13 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from blog.checks import require_shared_caches
+from blogicum.templates import warm_up_templates
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+os.environ.setdefault('BLOGICUM_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
+
+require_shared_caches()
+warm_up_templates()
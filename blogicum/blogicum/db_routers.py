@@ -0,0 +1,133 @@
+"""Чтение с реплик и закрепление запросов за основной базой.
+
+Реплики перечисляются в settings.DATABASE_REPLICAS, на них уходят
+чтения моделей из settings.DATABASE_REPLICA_MODELS. Запись и всё,
+что должно видеть только что записанное, идёт в 'default':
+    * запросы с небезопасными методами (POST и т. п.);
+    * запросы клиента в течение DATABASE_REPLICA_PIN_SECONDS после его
+      записи — PrimaryPinMiddleware ставит для этого cookie;
+    * код внутри with use_primary().
+Кэш, заполненный за это время строками отстающей реплики, сбрасывает
+повторный сдвиг версий (blog.tasks.bump_versions_after_write).
+Реплика, на которой применены не все миграции основной базы, не
+используется: её состояние перепроверяется раз в
+DATABASE_REPLICA_CHECK_SECONDS.
+"""
+import asyncio
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.utils.deprecation import MiddlewareMixin
+
+
+PIN_COOKIE = 'pin_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+_pinned = ContextVar('pinned_to_primary', default=False)
+_replica_checks = {}
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def is_migrated(alias):
+    """На реплике применены все миграции основной базы."""
+    try:
+        applied = MigrationRecorder(connections[alias]).applied_migrations()
+    except DatabaseError:
+        return False
+    primary = MigrationRecorder(
+        connections[DEFAULT_DB_ALIAS]
+    ).applied_migrations()
+    return set(primary) <= set(applied)
+
+
+def replica_ready(alias):
+    checked_at, ready = _replica_checks.get(alias, (None, False))
+    now = time.monotonic()
+    if (
+        checked_at is None
+        or now - checked_at > settings.DATABASE_REPLICA_CHECK_SECONDS
+    ):
+        ready = is_migrated(alias)
+        _replica_checks[alias] = now, ready
+    return ready
+
+
+@contextmanager
+def use_primary():
+    """Все чтения внутри блока идут в основную базу."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if not settings.DATABASE_REPLICAS or is_pinned():
+            return DEFAULT_DB_ALIAS
+        if model._meta.label_lower not in settings.DATABASE_REPLICA_MODELS:
+            return DEFAULT_DB_ALIAS
+        replicas = [
+            alias for alias in settings.DATABASE_REPLICAS
+            if replica_ready(alias)
+        ]
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
+
+
+class PrimaryPinMiddleware(MiddlewareMixin):
+    """Закрепляет за основной базой запись и чтение сразу после неё."""
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self.pin(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _pinned.reset(token)
+        return self.set_pin_cookie(request, response)
+
+    async def __acall__(self, request):
+        token = self.pin(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _pinned.reset(token)
+        return self.set_pin_cookie(request, response)
+
+    @staticmethod
+    def pin(request):
+        return _pinned.set(
+            request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES
+        )
+
+    @staticmethod
+    def set_pin_cookie(request, response):
+        if request.method not in SAFE_METHODS and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                PIN_COOKIE,
+                '1',
+                max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
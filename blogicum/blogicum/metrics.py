@@ -0,0 +1,289 @@
+"""Запросы к базе, время SQL, шаблонов и ответа по каждому view.
+
+QueryMetricsMiddleware копит показатели по имени view ('blog:index',
+'blog:post_detail' и т. д.) в памяти процесса. Они отдаются в формате
+Prometheus на /metrics/ и в отчёте команды query_report.
+
+Повторяющийся в одном ответе SQL считается вероятным N+1. Бюджеты
+запросов задаются в settings.BLOG_QUERY_BUDGETS по view и методу. При
+BLOG_QUERY_BUDGETS_STRICT превышение бюджета вызывает
+QueryBudgetExceeded, и тест с таким запросом падает.
+
+Под ASGI запросы к базе выполняются в общем потоке ORM, поэтому
+запрос относится к HTTP-запросу через ContextVar, а не через обёртку
+соединения на время ответа.
+"""
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils.deprecation import MiddlewareMixin
+
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+class QueryBudgetExceeded(Exception):
+    """View выполнил больше запросов, чем разрешено бюджетом"""
+
+
+class ViewStats:
+    """Накопленные показатели одного view"""
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.duplicates = 0
+        self.over_budget = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.seconds = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def add(self, record):
+        self.requests += 1
+        self.queries += record.queries
+        self.max_queries = max(self.max_queries, record.queries)
+        self.duplicates += record.duplicates
+        self.over_budget += record.over_budget
+        self.sql_seconds += record.sql_seconds
+        self.template_seconds += record.template_seconds
+        self.seconds += record.seconds
+        index = bisect_left(LATENCY_BUCKETS, record.seconds)
+        if index < len(self.buckets):
+            self.buckets[index] += 1
+
+
+class Registry:
+    """Показатели всех view одного процесса"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = defaultdict(ViewStats)
+
+    def add(self, view_name, record):
+        with self._lock:
+            self._views[view_name].add(record)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: vars(stats).copy()
+                for name, stats in sorted(self._views.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = Registry()
+
+
+class RequestRecord:
+    """Запросы к базе и тайминги одного HTTP-запроса"""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.seconds = 0.0
+        self.over_budget = 0
+        self.statements = Counter()
+        self._render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.queries += 1
+            self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values())
+
+    def repeated(self):
+        threshold = settings.BLOG_QUERY_DUPLICATE_THRESHOLD
+        return [
+            (sql, count) for sql, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+    def start_render(self):
+        self._render_started = time.perf_counter()
+
+    def finish_render(self, response):
+        if self._render_started is not None:
+            self.template_seconds += time.perf_counter() - self._render_started
+            self._render_started = None
+
+
+_current_record = ContextVar('query_record', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Обёртка соединения: учитывает запрос в записи текущего ответа."""
+    record = _current_record.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    return record(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def install_on_connect(sender, connection, **kwargs):
+    """Соединения потока ORM под ASGI получают обёртку при открытии."""
+    install_query_recorder(connection)
+
+
+def query_budget(view_name, method):
+    """Бюджет запросов из settings.BLOG_QUERY_BUDGETS или None."""
+    method = 'GET' if method == 'HEAD' else method
+    return settings.BLOG_QUERY_BUDGETS.get((view_name, method))
+
+
+class QueryMetricsMiddleware(MiddlewareMixin):
+    """Считает запросы к базе и время ответа для каждого view."""
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        for connection in connections.all():
+            install_query_recorder(connection)
+        record, token, started = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_record.reset(token)
+        self.stop(request, record, started)
+        return response
+
+    async def __acall__(self, request):
+        record, token, started = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_record.reset(token)
+        self.stop(request, record, started)
+        return response
+
+    @staticmethod
+    def start(request):
+        record = RequestRecord()
+        request._query_record = record
+        return record, _current_record.set(record), time.perf_counter()
+
+    def stop(self, request, record, started):
+        record.seconds = time.perf_counter() - started
+        match = request.resolver_match
+        if match is not None:
+            self.finish(match.view_name, request.method, record)
+
+    def process_template_response(self, request, response):
+        record = request._query_record
+        record.start_render()
+        response.add_post_render_callback(record.finish_render)
+        return response
+
+    def finish(self, view_name, method, record):
+        repeated = record.repeated()
+        if repeated:
+            logger.warning(
+                'Вероятный N+1 в %s: %s', view_name,
+                '; '.join(f'{count}× {sql}' for sql, count in repeated),
+            )
+        budget = query_budget(view_name, method)
+        record.over_budget = int(
+            budget is not None and record.queries > budget
+        )
+        registry.add(view_name, record)
+        if not record.over_budget:
+            return
+        message = (
+            f'{method} {view_name}: {record.queries} запросов к базе '
+            f'при бюджете {budget}'
+        )
+        if settings.BLOG_QUERY_BUDGETS_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+METRICS = (
+    ('requests', 'counter', 'Обработано запросов'),
+    ('queries', 'counter', 'Выполнено SQL-запросов'),
+    ('duplicates', 'counter', 'Повторных SQL-запросов (вероятный N+1)'),
+    ('over_budget', 'counter', 'Ответов с превышением бюджета запросов'),
+    ('sql_seconds', 'counter', 'Время выполнения SQL, секунды'),
+    ('template_seconds', 'counter', 'Время рендеринга шаблонов, секунды'),
+)
+
+
+def render_prometheus(snapshot):
+    """Показатели в текстовом формате Prometheus."""
+    lines = []
+    for name, kind, help_text in METRICS:
+        metric = f'blogicum_view_{name}_total'
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}']
+        lines += [
+            f'{metric}{{view="{view}"}} {stats[name]}'
+            for view, stats in snapshot.items()
+        ]
+    metric = 'blogicum_view_duration_seconds'
+    lines += [
+        f'# HELP {metric} Время ответа, секунды',
+        f'# TYPE {metric} histogram',
+    ]
+    for view, stats in snapshot.items():
+        total = 0
+        for bound, count in zip(LATENCY_BUCKETS, stats['buckets']):
+            total += count
+            lines.append(f'{metric}_bucket{{view="{view}",le="{bound}"}} '
+                         f'{total}')
+        lines += [
+            f'{metric}_bucket{{view="{view}",le="+Inf"}} {stats["requests"]}',
+            f'{metric}_sum{{view="{view}"}} {stats["seconds"]}',
+            f'{metric}_count{{view="{view}"}} {stats["requests"]}',
+        ]
+    return '\n'.join(lines) + '\n'
+
+
+def has_metrics_token(request):
+    """Заголовок Authorization: Bearer <BLOG_METRICS_TOKEN>."""
+    token = settings.BLOG_METRICS_TOKEN
+    return bool(token) and constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {token}'
+    )
+
+
+def metrics_view(request):
+    """Показатели процесса для Prometheus: персонал или токен сборщика.
+
+    REMOTE_ADDR за обратным прокси — адрес прокси, поэтому доступ по
+    INTERNAL_IPS открыл бы метрики всем.
+    """
+    if not (request.user.is_staff or has_metrics_token(request)):
+        raise Http404
+    return HttpResponse(
+        render_prometheus(registry.snapshot()),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
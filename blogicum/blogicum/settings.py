@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,7 +50,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blogicum.metrics.QueryMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'blogicum.staticfiles.StaticFilesMiddleware',
+    'blogicum.db_routers.PrimaryPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -60,16 +64,33 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'blogicum.urls'
 
+# Асинхронные ленты, пост и профиль (blog/async_views.py). Включаются
+# в blogicum/asgi.py; под WSGI остаются синхронные view.
+BLOG_ASYNC_VIEWS = os.environ.get('BLOGICUM_ASYNC_VIEWS') == '1'
+
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
+# Кэширующий загрузчик шаблонов и их прогрев при запуске воркера
+# (blogicum/templates.py). Без него изменения шаблонов видны сразу.
+BLOG_TEMPLATE_CACHE = not DEBUG
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': (
+                [('django.template.loaders.cached.Loader', TEMPLATE_LOADERS)]
+                if BLOG_TEMPLATE_CACHE else TEMPLATE_LOADERS
+            ),
             'context_processors': [
-                'django.template.context_processors.debug',
+                *(['django.template.context_processors.debug']
+                  if DEBUG else []),
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
@@ -84,13 +105,140 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# blogicum.sqlite — SQLite с WAL, PRAGMA и BEGIN IMMEDIATE,
+# настраивается через OPTIONS (см. blogicum/sqlite/base.py).
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'blogicum.sqlite',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
+
+# Реплика для чтения: путь к копии базы в переменной BLOGICUM_REPLICA_DB.
+# Локально её можно обновлять командой sync_sqlite_replica.
+if os.environ.get('BLOGICUM_REPLICA_DB'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['BLOGICUM_REPLICA_DB'],
+        'TEST': {'MIRROR': 'default'},
     }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_REPLICA_MODELS = [
+    'blog.post',
+    'blog.category',
+    'blog.location',
+    'blog.comment',
+    'auth.user',
+]
+
+# Наибольшее отставание реплик: столько после записи клиент читает из
+# основной базы, и через столько версии кэша сдвигаются повторно.
+DATABASE_REPLICA_PIN_SECONDS = 10
+
+# Как часто проверять, что на реплике применены все миграции.
+DATABASE_REPLICA_CHECK_SECONDS = 60
+
+DATABASE_ROUTERS = ['blogicum.db_routers.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum-default',
+    },
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum-pages',
+    },
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum-sessions',
+    },
+}
+
+# Кэш страниц для анонимных посетителей: алиас из CACHES и время жизни.
+# Версии кэша хранятся в 'default', поэтому при нескольких процессах
+# оба кэша должны быть общими, например FileBasedCache. Без DEBUG
+# проверка blog.checks не даёт запуститься с LocMemCache в этих кэшах
+# и в кэше сессий.
+BLOG_PAGE_CACHE_ALIAS = 'pages'
+
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Сессии: cached_db читает из кэша и пишет в кэш и базу сразу, выход
+# удаляет сессию из обоих; 'django.contrib.sessions.backends.signed_cookies'
+# — подписанные cookie без хранения на сервере. Отдельный кэш, чтобы
+# сессии не вытеснялись страницами; при нескольких процессах он тоже
+# должен быть общим, иначе выход не завершит сессию в других процессах.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+SESSION_CACHE_ALIAS = 'sessions'
+
+# Пользователь сессии берётся из кэша. ModelBackend остаётся для сессий,
+# созданных до перехода на CachedModelBackend.
+AUTHENTICATION_BACKENDS = [
+    'blog.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+
+# Метрики view: /metrics/ и команда query_report (см. blogicum/metrics.py).
+# Бюджет — наибольшее число запросов к базе за один ответ view на метод
+# (HEAD считается как GET) авторизованному пользователю при холодном кэше.
+# Для view и метода без бюджета запросы не ограничиваются.
+BLOG_QUERY_BUDGETS = {
+    ('blog:index', 'GET'): 2,
+    ('blog:category_posts', 'GET'): 2,
+    ('blog:post_detail', 'GET'): 3,
+    ('blog:profile', 'GET'): 3,
+    ('blog:search', 'GET'): 3,
+    ('blog:api_posts', 'GET'): 2,
+    ('blog:api_category_posts', 'GET'): 2,
+    ('blog:api_profile_posts', 'GET'): 3,
+    ('blog:api_post_comments', 'GET'): 3,
+    ('blog:posts_rss', 'GET'): 1,
+    ('blog:posts_atom', 'GET'): 1,
+    ('blog:category_rss', 'GET'): 1,
+    ('blog:category_atom', 'GET'): 1,
+    ('blog:profile_rss', 'GET'): 2,
+    ('blog:profile_atom', 'GET'): 2,
+    ('blog:create_post', 'GET'): 3,
+    ('blog:create_post', 'POST'): 6,
+    ('blog:edit_post', 'GET'): 4,
+    ('blog:edit_post', 'POST'): 8,
+    ('blog:delete_post', 'GET'): 2,
+    ('blog:delete_post', 'POST'): 8,
+    ('blog:edit_profile', 'GET'): 1,
+    ('blog:edit_profile', 'POST'): 3,
+    ('blog:add_comment', 'POST'): 6,
+    ('blog:edit_comment', 'GET'): 2,
+    ('blog:edit_comment', 'POST'): 4,
+    ('blog:delete_comment', 'GET'): 2,
+    ('blog:delete_comment', 'POST'): 6,
 }
 
+# Превышение бюджета: True — исключение QueryBudgetExceeded, иначе
+# предупреждение в лог. В тестах включается фикстурой из tests/conftest.py,
+# а tests/test_query_counts.py проверяет, что бюджеты точные.
+BLOG_QUERY_BUDGETS_STRICT = False
+
+# Сколько одинаковых SQL-запросов за ответ считать вероятным N+1.
+BLOG_QUERY_DUPLICATE_THRESHOLD = 3
+
+# Токен сборщика метрик: /metrics/ с заголовком
+# Authorization: Bearer <токен>. Без токена метрики видит только персонал.
+BLOG_METRICS_TOKEN = os.environ.get('BLOGICUM_METRICS_TOKEN', '')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -126,7 +274,7 @@ USE_TZ = True
 
 
 STATICFILES_DIRS = [
-    BASE_DIR / 'templates',
+    BASE_DIR / 'static',
 ]
 
 # Static files (CSS, JavaScript, Images)
@@ -134,6 +282,14 @@ STATICFILES_DIRS = [
 
 STATIC_URL = '/static/'
 
+# collectstatic кладёт сюда файлы с хешем в имени и сжатые копии;
+# без DEBUG их раздаёт из памяти blogicum.staticfiles.StaticFilesMiddleware.
+STATIC_ROOT = BASE_DIR / 'collected_static'
+
+STATICFILES_STORAGE = (
+    'blogicum.staticfiles.CompressedManifestStaticFilesStorage'
+)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -149,6 +305,15 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 MEDIA_URL = 'media/'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = 'blog.mail.QueuedEmailBackend'
+
+# Письма из очереди отправляет воркер run_jobs через этот бэкенд.
+BLOG_QUEUED_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+# Фоновые задачи выполняет воркер: python manage.py run_jobs.
+# В режиме EAGER задачи выполняются сразу после коммита транзакции.
+BLOG_JOBS_EAGER = False
+
+BLOG_JOBS_VISIBILITY_TIMEOUT = 60 * 5
@@ -0,0 +1,58 @@
+"""SQLite-бэкенд с настройками для параллельных читателей и писателей.
+
+WAL позволяет читать во время записи, а транзакции по умолчанию
+открываются как BEGIN IMMEDIATE: блокировка записи берётся сразу,
+и транзакция «прочитал, потом записал» ждёт busy_timeout вместо
+немедленной ошибки database is locked.
+
+OPTIONS базы данных дополнительно принимают:
+    pragmas — словарь PRAGMA поверх DEFAULT_PRAGMAS;
+    transaction_mode — DEFERRED, IMMEDIATE или EXCLUSIVE.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+TRANSACTION_MODES = ('DEFERRED', 'IMMEDIATE', 'EXCLUSIVE')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        kwargs.pop('pragmas', None)
+        kwargs.pop('transaction_mode', None)
+        return kwargs
+
+    @property
+    def pragmas(self):
+        options = self.settings_dict['OPTIONS']
+        return {**DEFAULT_PRAGMAS, **options.get('pragmas', {})}
+
+    @property
+    def transaction_mode(self):
+        mode = self.settings_dict['OPTIONS'].get(
+            'transaction_mode', 'IMMEDIATE'
+        ).upper()
+        if mode not in TRANSACTION_MODES:
+            raise ImproperlyConfigured(
+                f'transaction_mode должен быть одним из {TRANSACTION_MODES}'
+            )
+        return mode
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute(f'BEGIN {self.transaction_mode}')
@@ -0,0 +1,121 @@
+"""Нагрузка на SQLite: параллельные читатели ленты и писатели комментариев.
+
+Каждая конфигурация получает свою базу во временном файле и свой alias
+в connections, поэтому рабочая база не затрагивается.
+"""
+import threading
+import time
+
+from django.db import OperationalError, connections, transaction
+
+
+CONFIGS = {
+    'stock': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'OPTIONS': {},
+    },
+    'tuned': {
+        'ENGINE': 'blogicum.sqlite',
+        'OPTIONS': {'timeout': 20, 'transaction_mode': 'IMMEDIATE'},
+    },
+}
+SCHEMA = (
+    'CREATE TABLE post (id INTEGER PRIMARY KEY, pub_date TEXT NOT NULL,'
+    ' title TEXT NOT NULL, comments_count INTEGER NOT NULL DEFAULT 0)',
+    'CREATE INDEX post_pub_date ON post (pub_date DESC)',
+    'CREATE TABLE comment (id INTEGER PRIMARY KEY,'
+    ' post_id INTEGER NOT NULL, text TEXT NOT NULL)',
+    'CREATE INDEX comment_post ON comment (post_id)',
+)
+POSTS = 1000
+
+
+def run_stress(name, path, readers, writers, seconds):
+    """Счётчики чтений, записей и ошибок блокировки за seconds секунд."""
+    alias = f'sqlite_stress_{name}'
+    connections.settings[alias] = {**CONFIGS[name], 'NAME': str(path)}
+    try:
+        create_schema(alias)
+        counters = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+        deadline = time.monotonic() + seconds
+        threads = [
+            threading.Thread(
+                target=worker,
+                args=(alias, work, deadline, counters, lock),
+            )
+            for work in [read] * readers + [write] * writers
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return counters
+    finally:
+        connections[alias].close()
+        del connections.settings[alias]
+
+
+def create_schema(alias):
+    with connections[alias].cursor() as cursor:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+        cursor.executemany(
+            'INSERT INTO post (id, pub_date, title) VALUES (%s, %s, %s)',
+            [
+                (pk, f'2024-01-01 00:{pk // 60:02d}:{pk % 60:02d}', 'x')
+                for pk in range(1, POSTS + 1)
+            ],
+        )
+
+
+def worker(alias, work, deadline, counters, lock):
+    done = errors = 0
+    try:
+        while time.monotonic() < deadline:
+            try:
+                work(alias, done)
+            except OperationalError as error:
+                if 'locked' not in str(error):
+                    raise
+                errors += 1
+            else:
+                done += 1
+    finally:
+        connections[alias].close()
+    key = 'reads' if work is read else 'writes'
+    with lock:
+        counters[key] += done
+        counters['errors'] += errors
+
+
+def read(alias, iteration):
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            'SELECT id, title, comments_count FROM post '
+            'ORDER BY pub_date DESC LIMIT 10 OFFSET %s',
+            [iteration % 50 * 10],
+        )
+        cursor.fetchall()
+
+
+def write(alias, iteration):
+    # Как CommentCreateView в транзакции: прочитать пост, добавить
+    # комментарий и увеличить счётчик.
+    post_id = iteration % POSTS + 1
+    with transaction.atomic(using=alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                'SELECT comments_count FROM post WHERE id = %s',
+                [post_id],
+            )
+            cursor.fetchone()
+            cursor.execute(
+                'INSERT INTO comment (post_id, text) VALUES (%s, %s)',
+                [post_id, 'stress'],
+            )
+            cursor.execute(
+                'UPDATE post SET comments_count = comments_count + 1 '
+                'WHERE id = %s',
+                [post_id],
+            )
@@ -0,0 +1,205 @@
+"""Статика с хешем в имени, предварительным сжатием и раздачей из памяти.
+
+CompressedManifestStaticFilesStorage при collectstatic добавляет к
+именам файлов хеш содержимого и кладёт рядом сжатые копии .gz и, если
+установлен пакет brotli, .br. Копия остаётся, только если она заметно
+меньше оригинала.
+
+StaticFilesMiddleware при запуске процесса читает STATIC_ROOT в память
+и отдаёт файлы без обращения к диску: сжатую копию по Accept-Encoding,
+для имён с хешем — с Cache-Control immutable на год. В DEBUG статику
+по-прежнему раздаёт runserver.
+"""
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage, staticfiles_storage
+)
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import parse_etags
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.json', '.svg', '.ico', '.txt', '.xml',
+    '.html', '.webmanifest', '.eot', '.otf', '.ttf',
+)
+# Сжатая копия сохраняется, если она хотя бы на 5% меньше оригинала.
+MIN_COMPRESSION_RATIO = 0.95
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+MUTABLE_MAX_AGE = 60
+# Файлы крупнее читаются с диска при каждом запросе.
+MAX_MEMORY_FILE_SIZE = 2 * 1024 * 1024
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def compress(content):
+    """Сжатые варианты содержимого: {расширение: байты}."""
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content)
+    return {
+        extension: compressed for extension, compressed in variants.items()
+        if len(compressed) < len(content) * MIN_COMPRESSION_RATIO
+    }
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Манифест с хешами и сжатые копии файлов для раздачи."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Промежуточные имена CSS удаляются, поэтому сжимаются
+        # исходные файлы и окончательные имена из манифеста.
+        for name in paths:
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            hashed_name = self.hashed_files.get(
+                self.hash_key(self.clean_name(name))
+            )
+            for stored in {name, hashed_name} - {None}:
+                self.save_compressed(stored)
+
+    def save_compressed(self, name):
+        with self.open(name) as file:
+            content = file.read()
+        for extension, compressed in compress(content).items():
+            path = self.path(name + extension)
+            with open(path, 'wb') as file:
+                file.write(compressed)
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме явно запрещённых через q=0."""
+    accepted = set()
+    for item in header.split(','):
+        encoding, _, params = item.strip().partition(';')
+        quality = params.strip().partition('q=')[2]
+        try:
+            if quality and float(quality) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(encoding.strip().lower())
+    return accepted
+
+
+class StaticFile:
+    """Файл STATIC_ROOT с заголовками и сжатыми вариантами в памяти."""
+
+    def __init__(self, path, immutable):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.content_type = (
+            mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        )
+        self.cache_control = 'public, max-age={}{}'.format(
+            IMMUTABLE_MAX_AGE if immutable else MUTABLE_MAX_AGE,
+            ', immutable' if immutable else '',
+        )
+        self.variants = {}
+        if self.size > MAX_MEMORY_FILE_SIZE:
+            return
+        for encoding, extension in (('identity', ''), *ENCODINGS):
+            if os.path.exists(path + extension):
+                with open(path + extension, 'rb') as file:
+                    content = file.read()
+                self.variants[encoding] = (
+                    content, '"{}"'.format(hashlib.md5(content).hexdigest())
+                )
+
+    def response(self, request):
+        if not self.variants:
+            response = FileResponse(
+                open(self.path, 'rb'), content_type=self.content_type
+            )
+            response['Cache-Control'] = self.cache_control
+            return response
+        accepted = accepted_encodings(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        encoding = next(
+            (
+                encoding for encoding, _ in ENCODINGS
+                if encoding in accepted and encoding in self.variants
+            ),
+            'identity',
+        )
+        content, etag = self.variants[encoding]
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                b'' if request.method == 'HEAD' else content,
+                content_type=self.content_type,
+            )
+            response['Content-Length'] = len(content)
+            if encoding != 'identity':
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Cache-Control'] = self.cache_control
+        if len(self.variants) > 1:
+            response['Vary'] = 'Accept-Encoding'
+        return response
+
+
+def load_static_files(root, url, hashed_names):
+    """{URL: StaticFile} для всех файлов root, кроме сжатых копий."""
+    files = {}
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            if filename.endswith(tuple(
+                extension for _, extension in ENCODINGS
+            )):
+                continue
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            files[url + name] = StaticFile(path, name in hashed_names)
+    return files
+
+
+class StaticFilesMiddleware(MiddlewareMixin):
+    """Раздаёт собранную collectstatic статику из памяти процесса."""
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        root = settings.STATIC_ROOT
+        if settings.DEBUG or not root or not os.path.isdir(root):
+            raise MiddlewareNotUsed
+        hashed_names = set(
+            getattr(staticfiles_storage, 'hashed_files', {}).values()
+        )
+        self.files = load_static_files(
+            root, settings.STATIC_URL, hashed_names
+        )
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.static_response(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        response = self.static_response(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
+
+    def static_response(self, request):
+        if request.method in ('GET', 'HEAD'):
+            static_file = self.files.get(request.path_info)
+            if static_file is not None:
+                return static_file.response(request)
+        return None
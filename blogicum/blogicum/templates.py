@@ -0,0 +1,46 @@
+"""Шаблоны в production: кэширующий загрузчик и прогрев при запуске.
+
+При BLOG_TEMPLATE_CACHE загрузчики в settings.TEMPLATES обёрнуты в
+django.template.loaders.cached.Loader: шаблон разбирается один раз на
+процесс. warm_up_templates() разбирает заранее все шаблоны из DIRS,
+чтобы первые запросы после запуска воркера не платили за разбор.
+"""
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.template import engines
+
+
+logger = logging.getLogger(__name__)
+
+
+def template_names(directory):
+    for root, _, filenames in os.walk(directory):
+        for filename in filenames:
+            if filename.endswith('.html'):
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def warm_up_templates():
+    """Разбирает шаблоны из DIRS и возвращает их число.
+
+    Без кэширующего загрузчика разобранные шаблоны не сохраняются,
+    поэтому прогрев пропускается.
+    """
+    if not settings.BLOG_TEMPLATE_CACHE:
+        return 0
+    started = time.perf_counter()
+    loaded = 0
+    for engine in engines.all():
+        for directory in getattr(engine, 'engine', engine).dirs:
+            for name in template_names(directory):
+                engine.get_template(name)
+                loaded += 1
+    logger.info(
+        'Разобрано шаблонов: %s за %.3f с',
+        loaded, time.perf_counter() - started,
+    )
+    return loaded
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+from django.core.cache import caches
+from django.utils import timezone
+
+from blog.lookups import refresh_lookups
+from blog.models import Category, Location, Post
+
+
+@pytest.fixture(autouse=True)
+def clear_caches(settings):
+    for alias in settings.CACHES:
+        caches[alias].clear()
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budgets(settings):
+    settings.BLOG_QUERY_BUDGETS_STRICT = True
+
+
+# Фикстуры выполняют колбэки on_commit, как настоящий commit: версии
+# кэша сдвигаются, справочники пересобираются.
+@pytest.fixture
+def author(django_user_model, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        return django_user_model.objects.create_user(
+            'author', password='author'
+        )
+
+
+@pytest.fixture
+def author_client(client, author):
+    client.force_login(author)
+    return client
+
+
+@pytest.fixture
+def lookups(db):
+    return refresh_lookups()
+
+
+@pytest.fixture
+def category(db, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        return Category.objects.create(
+            title='Категория', description='Описание', slug='category'
+        )
+
+
+@pytest.fixture
+def location(db, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        return Location.objects.create(name='Место')
+
+
+@pytest.fixture
+def posts(author, category, location, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        return [
+            Post.objects.create(
+                title=f'Пост {number}',
+                text=f'Текст поста {number}',
+                pub_date=timezone.now() - timezone.timedelta(hours=number),
+                author=author,
+                category=category,
+                location=location,
+            )
+            for number in range(1, 16)
+        ]
+
+
+@pytest.fixture
+def post(posts):
+    return posts[0]
+
+
+@pytest.fixture
+def posts_fixture(tmp_path, author, category):
+    """Фикстура loaddata с прошедшим и будущим постом."""
+    now = timezone.now()
+    path = tmp_path / 'posts.json'
+    path.write_text(json.dumps([
+        {
+            'model': 'blog.post',
+            'pk': pk,
+            'fields': {
+                'title': f'Пост {pk}',
+                'text': 'Текст поста\nиз <фикстуры>',
+                'pub_date': (
+                    now + timezone.timedelta(hours=hours)
+                ).isoformat(),
+                'created_at': now.isoformat(),
+                'is_published': True,
+                'author': author.pk,
+                'category': category.pk,
+            },
+        }
+        for pk, hours in ((1, -1), (2, 1))
+    ]))
+    return path
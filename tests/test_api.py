@@ -0,0 +1,111 @@
+import json
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+
+from blog.api import (
+    API_MAX_PAGE_SIZE, NDJSON_CONTENT_TYPE, POST_DEFAULT_FIELDS,
+    ValuesApiView
+)
+from blog.models import Comment
+
+API_URL = '/api/posts/'
+
+
+@pytest.fixture
+def post_ids(posts):
+    return [post.pk for post in posts]
+
+
+def get_json(client, url=API_URL, status=200, **params):
+    response = client.get(url, params)
+    assert response.status_code == status, response.content
+    return response.json()
+
+
+def test_default_fields(client, post_ids):
+    results = get_json(client)['results']
+    assert [row['id'] for row in results] == post_ids
+    assert list(results[0]) == list(POST_DEFAULT_FIELDS)
+    assert results[0]['category'] == 'category'
+
+
+def test_requested_fields(client, post_ids):
+    results = get_json(client, fields='title, id,title')['results']
+    assert list(results[0]) == ['title', 'id']
+
+
+@pytest.mark.parametrize('fields', ['id,secret', ',,', 'author__password'])
+def test_unknown_fields_rejected(client, posts, fields):
+    assert 'error' in get_json(client, status=400, fields=fields)
+
+
+@pytest.mark.parametrize('limit, size', [
+    (5, 5), (0, 1), (-3, 1), (API_MAX_PAGE_SIZE * 10, 15),
+])
+def test_limit_is_clamped(client, post_ids, limit, size):
+    assert len(get_json(client, limit=limit)['results']) == size
+
+
+def test_limit_must_be_number(client, posts):
+    assert get_json(client, status=400, limit='много')['error']
+
+
+def test_cursor_walks_all_pages(client, post_ids):
+    page = get_json(client, fields='id', limit=4)
+    assert page['previous'] is None
+    seen = [row['id'] for row in page['results']]
+    while page['next']:
+        page = get_json(client, page['next'])
+        seen += [row['id'] for row in page['results']]
+    assert seen == post_ids
+    previous = get_json(client, page['previous'])
+    assert [row['id'] for row in previous['results']] == post_ids[8:12]
+
+
+@pytest.mark.parametrize('cursor', ['мусор', 'e30', 'bm90IGpzb24'])
+def test_invalid_cursor_rejected(client, posts, cursor):
+    assert get_json(client, status=400, cursor=cursor)['error']
+
+
+@pytest.mark.parametrize('name, kwargs', [
+    ('blog:api_category_posts', {'category_slug': 'missing'}),
+    ('blog:api_profile_posts', {'username': 'missing'}),
+    ('blog:api_post_comments', {'post_id': 0}),
+])
+def test_not_found_is_json(client, posts, name, kwargs):
+    assert get_json(client, reverse(name, kwargs=kwargs), status=404)['error']
+
+
+def test_comments(client, post, author):
+    Comment.objects.create(post=post, author=author, text='Первый')
+    Comment.objects.create(post=post, author=author, text='Второй')
+    url = reverse('blog:api_post_comments', args=(post.pk,))
+    results = get_json(client, url)['results']
+    assert [row['text'] for row in results] == ['Первый', 'Второй']
+    assert results[0]['author'] == 'author'
+
+
+def test_ndjson_streams_whole_queryset(client, post_ids):
+    response = client.get(
+        API_URL, {'format': 'ndjson', 'fields': 'id,title', 'limit': 2}
+    )
+    assert response.streaming
+    assert response['Content-Type'] == NDJSON_CONTENT_TYPE
+    lines = b''.join(response.streaming_content).decode().splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [row['id'] for row in rows] == post_ids
+    assert rows[0] == {'id': post_ids[0], 'title': 'Пост 1'}
+
+
+def test_ndjson_validates_fields(client, posts):
+    response = client.get(API_URL, {'format': 'ndjson', 'fields': 'secret'})
+    assert response.status_code == 400
+
+
+def test_base_view_requires_queryset(rf):
+    view = ValuesApiView()
+    view.setup(rf.get(API_URL))
+    with pytest.raises(ImproperlyConfigured):
+        view.get_queryset()
@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+from django.core.handlers.asgi import ASGIHandler
+from django.urls import reverse
+
+from blog.benchmarks import asgi_client, async_views
+
+CLIENTS = 8
+DELAY = 0.05
+
+
+def test_asgi_serves_slow_clients_concurrently(transactional_db, post):
+    with async_views():
+        application = ASGIHandler()
+        paths = [
+            reverse('blog:index'),
+            reverse('blog:category_posts', args=(post.category.slug,)),
+            reverse('blog:post_detail', args=(post.pk,)),
+            reverse('blog:profile', args=(post.author.username,)),
+        ] * (CLIENTS // 4)
+
+        async def serve():
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(
+                asgi_client(application, path, DELAY) for path in paths
+            ))
+            return time.perf_counter() - started, responses
+
+        elapsed, responses = asyncio.run(serve())
+    assert [status for status, _ in responses] == [200] * len(paths)
+    # Синхронному воркеру нужно не меньше 2 * DELAY на клиента.
+    assert elapsed < len(paths) * 2 * DELAY
@@ -0,0 +1,14 @@
+from django.urls import get_resolver
+
+from blog.management.commands.benchmark_urls import Command
+
+
+def test_every_url_has_benchmark_route():
+    names = set()
+    for namespace in ('blog', 'pages'):
+        _, resolver = get_resolver().namespace_dict[namespace]
+        names |= {
+            f'{namespace}:{name}' for name in resolver.reverse_dict
+            if isinstance(name, str)
+        }
+    assert {name for name, *_ in Command.routes()} == names
@@ -0,0 +1,45 @@
+import io
+
+import pytest
+from django.contrib.auth.models import Group, Permission
+
+from blog.bulk import dump_fixture, load_fixture
+from blog.models import Post
+
+
+def reload(*querysets):
+    stream = io.StringIO()
+    dump_fixture(querysets, stream)
+    stream.seek(0)
+    return load_fixture(stream, 'default')[0]
+
+
+@pytest.mark.django_db
+def test_existing_permissions_are_replaced():
+    permissions = Permission.objects.order_by('pk')
+    count = permissions.count()
+    loaded = reload(permissions)
+    assert loaded == {Permission: count}
+    assert permissions.count() == count
+
+
+def test_rows_with_same_pk_are_replaced(posts, author):
+    fixture = io.StringIO()
+    dump_fixture([Post.objects.all()], fixture)
+    Post.objects.filter(pk=posts[0].pk).update(title='Изменён')
+    fixture.seek(0)
+    load_fixture(fixture, 'default')
+    assert Post.objects.count() == len(posts)
+    assert Post.objects.get(pk=posts[0].pk).title == posts[0].title
+
+
+def test_many_to_many_is_replaced(author):
+    editors = Group.objects.create(name='editors')
+    readers = Group.objects.create(name='readers')
+    author.groups.add(editors)
+    fixture = io.StringIO()
+    dump_fixture([type(author).objects.all()], fixture)
+    author.groups.set([readers])
+    fixture.seek(0)
+    load_fixture(fixture, 'default')
+    assert list(author.groups.all()) == [editors]
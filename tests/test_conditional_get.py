@@ -0,0 +1,66 @@
+import pytest
+from django.urls import reverse
+
+
+@pytest.fixture
+def urls(post, category, author):
+    return [
+        reverse('blog:index'),
+        reverse('blog:category_posts', args=(category.slug,)),
+        reverse('blog:post_detail', args=(post.pk,)),
+        reverse('blog:profile', args=(author.username,)),
+        reverse('blog:api_posts'),
+        reverse('blog:api_post_comments', args=(post.pk,)),
+    ]
+
+
+@pytest.mark.django_db
+def test_matching_etag_answers_304_without_queries(
+    client, urls, django_assert_num_queries
+):
+    for url in urls:
+        etag = client.get(url)['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, url
+        assert response['ETag'] == etag
+
+
+@pytest.mark.django_db
+def test_page_cache_hit_runs_no_queries(
+    client, urls, django_assert_num_queries
+):
+    for url in urls[:3]:
+        client.get(url)
+        with django_assert_num_queries(0):
+            assert client.get(url).status_code == 200
+
+
+@pytest.mark.django_db
+def test_no_last_modified(client, urls):
+    for url in urls:
+        assert not client.get(url).has_header('Last-Modified'), url
+
+
+@pytest.mark.django_db
+def test_edit_changes_etag(
+    client, post, urls, django_capture_on_commit_callbacks
+):
+    etags = {url: client.get(url)['ETag'] for url in urls}
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = 'Новый заголовок'
+        post.save()
+    for url in urls:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+        assert response.status_code == 200, url
+        assert response['ETag'] != etags[url]
+    detail = reverse('blog:post_detail', args=(post.pk,))
+    assert 'Новый заголовок' in client.get(detail).content.decode()
+
+
+@pytest.mark.django_db
+def test_etag_depends_on_user(client, author_client, post):
+    url = reverse('blog:post_detail', args=(post.pk,))
+    etag = author_client.get(url)['ETag']
+    client.logout()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
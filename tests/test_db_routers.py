@@ -0,0 +1,64 @@
+import pytest
+
+from django.http import HttpResponse
+from django.utils import timezone
+
+from blog.models import Job, Post
+from blog.tasks import bump_cache_versions, bump_versions_after_write
+from blogicum import db_routers
+from blogicum.db_routers import (
+    PIN_COOKIE, PrimaryPinMiddleware, ReplicaRouter, use_primary
+)
+
+
+@pytest.fixture
+def replica(settings, monkeypatch):
+    settings.DATABASE_REPLICAS = ['replica']
+    migrated = {'replica': True}
+    monkeypatch.setattr(db_routers, '_replica_checks', {})
+    monkeypatch.setattr(db_routers, 'is_migrated', migrated.__getitem__)
+    return migrated
+
+
+def test_reads_go_to_migrated_replica(replica):
+    assert ReplicaRouter().db_for_read(Post) == 'replica'
+
+
+def test_unmigrated_replica_is_skipped(replica):
+    replica['replica'] = False
+    assert ReplicaRouter().db_for_read(Post) == 'default'
+
+
+@pytest.mark.django_db
+def test_write_rebumps_versions_after_replica_lag(replica, settings):
+    bump_versions_after_write('post:1', 'feed')
+    # Чужие чтения остаются на реплике.
+    assert ReplicaRouter().db_for_read(Post) == 'replica'
+    job = Job.objects.get(name=bump_cache_versions.job_name)
+    assert job.payload == {'scopes': ['feed', 'post:1']}
+    lag = job.run_after - timezone.now()
+    assert 0 < lag.total_seconds() <= settings.DATABASE_REPLICA_PIN_SECONDS
+
+
+@pytest.mark.parametrize('method, cookies, pinned', (
+    ('GET', {}, False),
+    ('GET', {PIN_COOKIE: '1'}, True),
+    ('POST', {}, True),
+))
+def test_writer_is_pinned(replica, rf, method, cookies, pinned):
+    seen = []
+
+    def view(request):
+        seen.append(ReplicaRouter().db_for_read(Post))
+        return HttpResponse()
+
+    request = getattr(rf, method.lower())('/')
+    request.COOKIES.update(cookies)
+    PrimaryPinMiddleware(view)(request)
+    assert seen == ['default' if pinned else 'replica']
+
+
+def test_use_primary(replica):
+    with use_primary():
+        assert ReplicaRouter().db_for_read(Post) == 'default'
+    assert ReplicaRouter().db_for_read(Post) == 'replica'
@@ -0,0 +1,102 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+
+from blog import jobs
+from blog.models import Comment, Job, Post
+from blog.tasks import publish_scheduled_posts
+
+FEEDS = ('rss', 'atom')
+
+
+@pytest.fixture
+def feed_urls(post, category, author):
+    return [
+        *(reverse(f'blog:posts_{feed}') for feed in FEEDS),
+        *(
+            reverse(f'blog:category_{feed}', args=(category.slug,))
+            for feed in FEEDS
+        ),
+        *(
+            reverse(f'blog:profile_{feed}', args=(author.username,))
+            for feed in FEEDS
+        ),
+    ]
+
+
+def get_etags(client, urls):
+    return {url: client.get(url)['ETag'] for url in urls}
+
+
+def assert_invalidated(client, etags, title):
+    for url, etag in etags.items():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, url
+        assert response['ETag'] != etag
+        assert title in response.content.decode(), url
+
+
+def test_matching_etag_answers_304_without_queries(
+    client, feed_urls, django_assert_num_queries
+):
+    for url, etag in get_etags(client, feed_urls).items():
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, url
+        assert response['ETag'] == etag
+
+
+def test_cached_feed_runs_no_queries(
+    client, feed_urls, django_assert_num_queries
+):
+    for url in feed_urls:
+        first = client.get(url)
+        assert not first.has_header('Last-Modified'), url
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response.content == first.content
+
+
+def test_new_post_invalidates_feeds(
+    client, feed_urls, author, category, django_capture_on_commit_callbacks
+):
+    etags = get_etags(client, feed_urls)
+    with django_capture_on_commit_callbacks(execute=True):
+        Post.objects.create(
+            title='Свежий пост', text='Текст', pub_date=timezone.now(),
+            author=author, category=category,
+        )
+    assert_invalidated(client, etags, 'Свежий пост')
+
+
+def test_scheduled_publication_invalidates_feeds(
+    client, feed_urls, author, category, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        scheduled = Post.objects.create(
+            title='Отложенный пост', text='Текст',
+            pub_date=timezone.now() + timezone.timedelta(hours=1),
+            author=author, category=category,
+        )
+    etags = get_etags(client, feed_urls)
+    for url in feed_urls:
+        assert 'Отложенный пост' not in client.get(url).content.decode()
+    # Время публикации наступило.
+    past = timezone.now() - timezone.timedelta(seconds=1)
+    Post.objects.filter(pk=scheduled.pk).update(pub_date=past)
+    Job.objects.filter(name=publish_scheduled_posts.job_name).update(
+        run_after=past
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        assert jobs.run_pending() == 1
+    assert_invalidated(client, etags, 'Отложенный пост')
+
+
+def test_comment_keeps_feeds(
+    client, feed_urls, post, author, django_capture_on_commit_callbacks
+):
+    etags = get_etags(client, feed_urls)
+    with django_capture_on_commit_callbacks(execute=True):
+        Comment.objects.create(post=post, author=author, text='Текст')
+    for url, etag in etags.items():
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
@@ -0,0 +1,78 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+
+from blog.images import IMAGE_WIDTHS, derivative_name
+from blog.models import Post
+
+
+@pytest.fixture(autouse=True)
+def media(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.BLOG_JOBS_EAGER = True
+
+
+def upload(name, width=1200, height=800):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'red').save(buffer, 'JPEG')
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/jpeg')
+
+
+def save_image(post, file, capture):
+    with capture(execute=True):
+        post.image = file
+        post.save()
+    post.refresh_from_db()
+
+
+def derivatives_exist(post):
+    storage = post.image.storage
+    return [
+        storage.exists(derivative_name(post.image.name, width))
+        for width in post.image_variants
+    ]
+
+
+def test_srcset_includes_original_width(
+    post, django_capture_on_commit_callbacks
+):
+    save_image(post, upload('photo.jpg'), django_capture_on_commit_callbacks)
+    assert post.image_variants == [*IMAGE_WIDTHS, 1200]
+    assert post.image_srcset.split(', ')[-1].endswith(' 1200w')
+    assert post.image_preview_url.endswith(
+        f'_{IMAGE_WIDTHS[-1]}w.webp'
+    )
+    assert all(derivatives_exist(post))
+
+
+def test_small_image_is_not_upscaled(
+    post, django_capture_on_commit_callbacks
+):
+    save_image(
+        post, upload('small.jpg', 500, 300),
+        django_capture_on_commit_callbacks
+    )
+    assert post.image_variants == [320, 500]
+    assert post.image_preview_url.endswith('_500w.webp')
+
+
+def test_replaced_image_derivatives_are_deleted(
+    post, django_capture_on_commit_callbacks
+):
+    save_image(post, upload('first.jpg'), django_capture_on_commit_callbacks)
+    first = Post.objects.get(pk=post.pk)
+    save_image(post, upload('second.jpg'), django_capture_on_commit_callbacks)
+    assert not any(derivatives_exist(first))
+    assert all(derivatives_exist(post))
+
+
+def test_deleted_post_derivatives_are_deleted(
+    post, django_capture_on_commit_callbacks
+):
+    save_image(post, upload('photo.jpg'), django_capture_on_commit_callbacks)
+    assert all(derivatives_exist(post))
+    with django_capture_on_commit_callbacks(execute=True):
+        Post.objects.get(pk=post.pk).delete()
+    assert not any(derivatives_exist(post))
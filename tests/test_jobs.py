@@ -0,0 +1,50 @@
+import pytest
+from django.core.mail import EmailMessage
+from django.utils import timezone
+
+from blog import jobs
+from blog.mail import QueuedEmailBackend
+from blog.models import Job
+
+
+pytestmark = pytest.mark.django_db
+
+
+def crash(job):
+    """Воркер упал посреди задачи: блокировка просто истекает."""
+    Job.objects.filter(pk=job.pk).update(
+        locked_until=timezone.now() - timezone.timedelta(seconds=1)
+    )
+
+
+def test_crashed_job_fails_after_max_attempts():
+    job = Job.objects.create(name='blog.tasks.send_email', max_attempts=2)
+    for _ in range(job.max_attempts):
+        (claimed,) = jobs.claim(limit=10, visibility_timeout=60)
+        crash(claimed)
+    assert jobs.claim(limit=10, visibility_timeout=60) == []
+    job.refresh_from_db()
+    assert job.status == Job.FAILED
+    assert job.attempts == job.max_attempts
+    assert job.last_error == jobs.CRASHED_ERROR
+
+
+def test_locked_job_is_not_failed():
+    Job.objects.create(name='blog.tasks.send_email', max_attempts=1)
+    jobs.claim(limit=10, visibility_timeout=60)
+    assert jobs.claim(limit=10, visibility_timeout=60) == []
+    assert Job.objects.get().status == Job.QUEUED
+
+
+def test_queued_email_rejects_attachments():
+    message = EmailMessage('Тема', 'Текст', to=['user@example.com'])
+    message.attach('file.txt', 'данные', 'text/plain')
+    with pytest.raises(ValueError):
+        QueuedEmailBackend().send_messages([message])
+    assert not Job.objects.exists()
+
+
+def test_queued_email_is_enqueued():
+    message = EmailMessage('Тема', 'Текст', to=['user@example.com'])
+    assert QueuedEmailBackend().send_messages([message]) == 1
+    assert Job.objects.get().payload['messages'][0]['subject'] == 'Тема'
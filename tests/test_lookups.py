@@ -0,0 +1,37 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from blog import lookups
+from blog.models import Category, Location
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as captured:
+        assert client.get(url).status_code == 200
+    return len(captured)
+
+
+def test_lookups_refreshed_off_request_path(
+    author_client, posts, category, django_capture_on_commit_callbacks
+):
+    url = reverse('blog:index')
+    count_queries(author_client, url)
+    warm = count_queries(author_client, url)
+    with django_capture_on_commit_callbacks(execute=True):
+        category.title = 'Новое название'
+        category.save()
+        Location.objects.create(name='Новое место')
+    assert count_queries(author_client, url) == warm
+    assert lookups.get_lookups().categories[category.pk].title == (
+        'Новое название'
+    )
+
+
+def test_lookups_rebuilt_after_eviction(posts, monkeypatch):
+    cache.clear()
+    monkeypatch.setattr(lookups, '_lookups', None)
+    assert set(lookups.get_lookups().categories) == set(
+        Category.objects.values_list('pk', flat=True)
+    )
@@ -0,0 +1,38 @@
+import pytest
+from django.urls import reverse
+
+
+URL = reverse('metrics')
+
+
+@pytest.mark.django_db
+def test_metrics_hidden_from_internal_ip(client):
+    assert client.get(URL, REMOTE_ADDR='127.0.0.1').status_code == 404
+
+
+def test_metrics_hidden_from_non_staff(author_client):
+    assert author_client.get(URL).status_code == 404
+
+
+def test_metrics_for_staff(author_client, author):
+    author.is_staff = True
+    author.save()
+    assert author_client.get(URL).status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('header, status', (
+    ('Bearer secret', 200),
+    ('Bearer wrong', 404),
+    ('secret', 404),
+))
+def test_metrics_token(client, settings, header, status):
+    settings.BLOG_METRICS_TOKEN = 'secret'
+    response = client.get(URL, HTTP_AUTHORIZATION=header)
+    assert response.status_code == status
+
+
+@pytest.mark.django_db
+def test_empty_token_is_not_accepted(client, settings):
+    settings.BLOG_METRICS_TOKEN = ''
+    assert client.get(URL, HTTP_AUTHORIZATION='Bearer ').status_code == 404
@@ -0,0 +1,54 @@
+import base64
+import json
+
+import pytest
+
+from blog.models import Post
+from blog.paginators import CursorPaginator, InvalidCursor
+
+
+def make_cursor(payload):
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+@pytest.fixture
+def paginator():
+    return CursorPaginator(Post.objects.all(), 10, ('-pub_date', '-id'))
+
+
+@pytest.mark.parametrize('payload', [
+    {'p': ['2024-01-01T00:00:00+00:00', 99999999999999999999999]},
+    {'p': ['2024-01-01T00:00:00+00:00', -2 ** 64]},
+    {'p': ['2024-01-01T00:00:00+00:00', 'один']},
+    {'p': ['2024-01-01T00:00:00+00:00', None]},
+    {'p': ['2024-01-01T00:00:00+00:00', [1]]},
+    {'p': ['2024-01-01T00:00:00+00:00', True]},
+    {'p': ['не дата', 1]},
+    {'p': ['2024-01-01', 1]},
+    {'p': [1, 1]},
+    {'p': ['2024-01-01T00:00:00+00:00']},
+    {'q': []},
+])
+def test_invalid_cursor_values_rejected(paginator, payload):
+    with pytest.raises(InvalidCursor):
+        paginator.decode_cursor(make_cursor(payload))
+
+
+def test_cursor_values_coerced(paginator):
+    values, backwards = paginator.decode_cursor(
+        make_cursor({'p': ['2024-01-01T00:00:00+00:00', '7'], 'b': 1})
+    )
+    assert values[0].year == 2024 and values[0].tzinfo is not None
+    assert values[1] == 7
+    assert backwards
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url, status', [
+    ('/', 404),
+    ('/api/posts/', 400),
+])
+def test_huge_cursor_is_client_error(client, url, status):
+    cursor = make_cursor({'p': ['2024-01-01', 99999999999999999999999]})
+    assert client.get(url, {'cursor': cursor}).status_code == status
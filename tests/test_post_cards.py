@@ -0,0 +1,41 @@
+import pytest
+from django.urls import reverse
+
+from blog.models import Post
+
+
+def card_html(client, post):
+    """HTML карточки поста на главной странице."""
+    response = client.get(reverse('blog:index'))
+    cards = response.context['post_cards']
+    return str(cards[list(response.context['object_list']).index(post)])
+
+
+def change(obj, django_capture_on_commit_callbacks, **fields):
+    with django_capture_on_commit_callbacks(execute=True):
+        for name, value in fields.items():
+            setattr(obj, name, value)
+        obj.save()
+
+
+def test_card_comes_from_cache(author_client, post):
+    card_html(author_client, post)
+    # update() обходит сигналы, поэтому версии областей не сдвигаются.
+    Post.objects.filter(pk=post.pk).update(title='Незаметный заголовок')
+    assert 'Незаметный заголовок' not in card_html(author_client, post)
+
+
+@pytest.mark.parametrize('scope, field, value', [
+    ('post', 'title', 'Новый заголовок'),
+    ('category', 'title', 'Новая категория'),
+    ('location', 'name', 'Новое место'),
+    ('author', 'username', 'new_author'),
+])
+def test_change_invalidates_card(
+    author_client, post, scope, field, value,
+    django_capture_on_commit_callbacks
+):
+    assert value not in card_html(author_client, post)
+    obj = post if scope == 'post' else getattr(post, scope)
+    change(obj, django_capture_on_commit_callbacks, **{field: value})
+    assert value in card_html(author_client, post)
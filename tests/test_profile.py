@@ -0,0 +1,17 @@
+from django.urls import reverse
+
+
+def test_invalid_profile_form_keeps_request_user(
+    author_client, author, django_user_model, lookups
+):
+    django_user_model.objects.create_user('other', password='other')
+    response = author_client.post(
+        reverse('blog:edit_profile', args=(author.pk,)),
+        {'username': 'other', 'email': 'author@example.com'},
+    )
+    assert response.status_code == 200
+    assert response.context['form'].errors['username']
+    assert response.wsgi_request.user.username == 'author'
+    assert reverse('blog:profile', args=('other',)) not in (
+        response.content.decode()
+    )
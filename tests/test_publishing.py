@@ -0,0 +1,52 @@
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import jobs
+from blog.models import Job, Post
+from blog.tasks import publish_scheduled_posts
+
+
+@pytest.fixture
+def scheduled(author, category, django_capture_on_commit_callbacks):
+    now = timezone.now()
+    with django_capture_on_commit_callbacks(execute=True):
+        return [
+            Post.objects.create(
+                title=f'Отложенный пост {hours}',
+                text='Текст',
+                pub_date=now + timezone.timedelta(hours=hours),
+                author=author,
+                category=category,
+            )
+            for hours in (1, 2)
+        ]
+
+
+def test_each_scheduled_post_gets_published(
+    scheduled, django_capture_on_commit_callbacks
+):
+    first, second = scheduled
+    (job,) = Job.objects.filter(name=publish_scheduled_posts.job_name)
+    assert job.run_after == first.pub_date
+    # Время первой публикации наступило.
+    past = timezone.now() - timezone.timedelta(seconds=1)
+    Post.objects.filter(pk=first.pk).update(pub_date=past)
+    Job.objects.filter(pk=job.pk).update(run_after=past)
+    with django_capture_on_commit_callbacks(execute=True):
+        assert jobs.run_pending() == 1
+    assert Post.objects.get(pk=first.pk).is_live
+    assert not Post.objects.get(pk=second.pk).is_live
+    (job,) = Job.objects.filter(name=publish_scheduled_posts.job_name)
+    assert job.run_after == second.pub_date
+
+
+def test_loaddata_sets_is_live(
+    posts_fixture, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command('loaddata', posts_fixture, verbosity=0)
+    assert Post.objects.get(pk=1).is_live
+    assert not Post.objects.get(pk=2).is_live
+    (job,) = Job.objects.filter(name=publish_scheduled_posts.job_name)
+    assert job.run_after == Post.objects.get(pk=2).pub_date
@@ -0,0 +1,119 @@
+import pytest
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Comment, Post
+from blog.urls import urlpatterns
+from blogicum.metrics import query_budget
+
+LOGIN_REQUIRED = (
+    'blog:create_post', 'blog:edit_post', 'blog:delete_post',
+    'blog:edit_profile', 'blog:add_comment', 'blog:edit_comment',
+    'blog:delete_comment',
+)
+
+
+@pytest.fixture
+def comments(post, author):
+    Comment.objects.bulk_create(
+        Comment(post=post, author=author, text=f'Комментарий {number}')
+        for number in range(30)
+    )
+    Post.objects.filter(pk=post.pk).update(comments_count=30)
+    return list(Comment.objects.filter(post=post))
+
+
+@pytest.fixture
+def blog_url(post, category, author, comments):
+    comment_kwargs = {'post_id': post.pk, 'comment_id': comments[0].pk}
+    kwargs = {
+        'blog:category_posts': {'category_slug': category.slug},
+        'blog:post_detail': {'post_id': post.pk},
+        'blog:profile': {'username': author.username},
+        'blog:api_category_posts': {'category_slug': category.slug},
+        'blog:api_profile_posts': {'username': author.username},
+        'blog:api_post_comments': {'post_id': post.pk},
+        'blog:category_rss': {'category_slug': category.slug},
+        'blog:category_atom': {'category_slug': category.slug},
+        'blog:profile_rss': {'username': author.username},
+        'blog:profile_atom': {'username': author.username},
+        'blog:edit_post': {'post_id': post.pk},
+        'blog:delete_post': {'post_id': post.pk},
+        'blog:edit_profile': {'pk': author.pk},
+        'blog:add_comment': {'post_id': post.pk},
+        'blog:edit_comment': comment_kwargs,
+        'blog:delete_comment': comment_kwargs,
+    }
+    return lambda name: reverse(name, kwargs=kwargs.get(name, {}))
+
+
+@pytest.fixture
+def form_data(category, author):
+    """Верные данные форм: POST проходит проверку и сохраняет объект."""
+    post_form = {
+        'title': 'Новый пост',
+        'text': 'Текст нового поста',
+        'pub_date': timezone.now().strftime('%Y-%m-%dT%H:%M'),
+        'category': category.pk,
+        'is_published': 'on',
+    }
+    return {
+        'blog:search': {'q': 'пост'},
+        'blog:create_post': post_form,
+        'blog:edit_post': post_form,
+        'blog:edit_profile': {
+            'username': author.username,
+            'first_name': 'Имя',
+            'last_name': 'Фамилия',
+            'email': 'author@example.com',
+        },
+        'blog:add_comment': {'text': 'Новый комментарий'},
+        'blog:edit_comment': {'text': 'Исправленный комментарий'},
+    }
+
+
+def request(client, name, method, url, form_data):
+    response = getattr(client, method.lower())(url, form_data.get(name, {}))
+    assert response.status_code < 400, url
+    if method == 'POST':
+        assert response.status_code == 302, response.context['form'].errors
+    return response
+
+
+def test_every_blog_url_has_budget():
+    names = {f'blog:{pattern.name}' for pattern in urlpatterns}
+    assert names == {name for name, _ in settings.BLOG_QUERY_BUDGETS}
+
+
+@pytest.mark.parametrize('name, method', settings.BLOG_QUERY_BUDGETS)
+def test_author_reaches_budget(
+    name, method, transactional_db, author_client, blog_url, form_data,
+    django_assert_num_queries
+):
+    url = blog_url(name)
+    with django_assert_num_queries(settings.BLOG_QUERY_BUDGETS[name, method]):
+        request(author_client, name, method, url, form_data)
+
+
+@pytest.mark.parametrize('name', [
+    name for name, method in settings.BLOG_QUERY_BUDGETS
+    if method == 'GET' and name not in LOGIN_REQUIRED
+])
+def test_anonymous_within_budget(
+    name, client, blog_url, form_data, django_assert_max_num_queries
+):
+    url = blog_url(name)
+    budget = settings.BLOG_QUERY_BUDGETS[name, 'GET']
+    with django_assert_max_num_queries(budget):
+        request(client, name, 'GET', url, form_data)
+
+
+def test_budget_depends_on_method():
+    assert query_budget('blog:index', 'HEAD') == (
+        settings.BLOG_QUERY_BUDGETS['blog:index', 'GET']
+    )
+    assert query_budget('blog:create_post', 'POST') == (
+        settings.BLOG_QUERY_BUDGETS['blog:create_post', 'POST']
+    )
+    assert query_budget('blog:index', 'POST') is None
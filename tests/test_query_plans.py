@@ -0,0 +1,56 @@
+import re
+
+import pytest
+from django.db import connection
+
+from blog.models import Comment, Post
+from blog.utils import get_posts
+
+
+PAGE_SIZE = 11
+TABLES = ('blog_post', 'blog_comment')
+
+# Запросы страниц блога, которые должны идти по индексам.
+HOT_QUERIES = {
+    'feed': lambda: get_posts()[:PAGE_SIZE],
+    'category': lambda: get_posts().filter(category_id=1)[:PAGE_SIZE],
+    'profile': lambda: Post.objects.select_related('author').filter(
+        author_id=1
+    ).order_by('-pub_date', '-id')[:PAGE_SIZE],
+    'comments': lambda: Comment.objects.select_related('author').filter(
+        post_id=1
+    ).order_by('created_at', 'id')[:PAGE_SIZE],
+}
+
+
+def plan_problems(plan):
+    """Полный просмотр таблицы или сортировка во временном B-tree."""
+    problems = []
+    for line in plan.splitlines():
+        if 'USE TEMP B-TREE' in line:
+            problems.append(line)
+        elif any(re.search(rf'\bSCAN {table}\b', line) for table in TABLES):
+            if 'USING' not in line:
+                problems.append(line)
+    return problems
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='план в формате SQLite'
+)
+@pytest.mark.parametrize('name', HOT_QUERIES)
+def test_hot_query_uses_index(name):
+    plan = HOT_QUERIES[name]().explain()
+    assert plan_problems(plan) == [], plan
+
+
+def test_plan_problems_detects_scan_and_sort():
+    plan = (
+        'SCAN blog_post\n'
+        'SEARCH blog_comment USING INDEX blog_comment_post_id\n'
+        'USE TEMP B-TREE FOR ORDER BY'
+    )
+    assert plan_problems(plan) == [
+        'SCAN blog_post', 'USE TEMP B-TREE FOR ORDER BY'
+    ]
@@ -0,0 +1,43 @@
+import pytest
+from django.db import connection
+
+from blog.models import Post
+from blog.search import (
+    SEARCH_TRIGGERS, create_search_triggers, drop_search_triggers,
+    search_posts
+)
+
+
+class BlogMigration:
+    app_label = 'blog'
+
+
+def trigger_names():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        return {name for name, in cursor.fetchall()}
+
+
+@pytest.mark.django_db
+def test_triggers_installed_after_migrate():
+    assert set(SEARCH_TRIGGERS) <= trigger_names()
+
+
+def test_triggers_index_new_posts(post):
+    assert list(search_posts('Пост 1'))[:1] == [post]
+
+
+def test_missing_triggers_are_recreated_with_reindex(post):
+    drop_search_triggers('default', plan=[(BlogMigration(), False)])
+    assert not set(SEARCH_TRIGGERS) & trigger_names()
+    Post.objects.filter(pk=post.pk).update(title='Переименованный')
+    assert not list(search_posts('Переименованный'))
+    create_search_triggers('default')
+    assert set(SEARCH_TRIGGERS) <= trigger_names()
+    assert list(search_posts('Переименованный')) == [post]
+
+
+@pytest.mark.django_db
+def test_triggers_kept_without_blog_migrations():
+    drop_search_triggers('default', plan=[])
+    assert set(SEARCH_TRIGGERS) <= trigger_names()
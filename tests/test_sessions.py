@@ -0,0 +1,46 @@
+import pytest
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.test import Client
+from django.urls import reverse
+
+from blog.checks import check_shared_caches, require_shared_caches
+
+
+def test_logout_ends_copied_session(author_client, lookups, settings):
+    stolen = Client()
+    stolen.cookies[settings.SESSION_COOKIE_NAME] = (
+        author_client.cookies[settings.SESSION_COOKIE_NAME].value
+    )
+    author_client.get(reverse('logout'))
+    response = stolen.get(reverse('blog:index'))
+    assert not response.wsgi_request.user.is_authenticated
+
+
+def test_session_survives_cache_loss(author_client, lookups, settings):
+    # Сессия читается из базы: лишний запрос сверх бюджета.
+    settings.BLOG_QUERY_BUDGETS_STRICT = False
+    caches[settings.SESSION_CACHE_ALIAS].clear()
+    response = author_client.get(reverse('blog:index'))
+    assert response.wsgi_request.user.is_authenticated
+
+
+def test_per_process_caches_rejected_without_debug(settings):
+    settings.DEBUG = False
+    errors = check_shared_caches(None)
+    assert {error.id for error in errors} == {'blog.E001'}
+    assert len(errors) == 3
+    with pytest.raises(ImproperlyConfigured):
+        require_shared_caches()
+
+
+def test_shared_caches_accepted(settings, tmp_path):
+    settings.DEBUG = False
+    settings.CACHES = {
+        alias: {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path / alias),
+        }
+        for alias in settings.CACHES
+    }
+    assert check_shared_caches(None) == []
@@ -0,0 +1,95 @@
+from django.urls import reverse
+
+from blog.cache import FEED_SCOPE, PAGES_SCOPE, category_feed_scope
+from blog.models import Comment, Post
+from blog.signals import PendingBump
+
+
+def test_cascade_delete_bumps_once(
+    post, author, django_assert_max_num_queries,
+    django_capture_on_commit_callbacks
+):
+    Comment.objects.bulk_create(
+        Comment(post=post, author=author, text=f'Комментарий {number}')
+        for number in range(50)
+    )
+    scopes = {
+        f'post:{post.pk}', FEED_SCOPE, category_feed_scope(post.category.slug)
+    }
+    with django_capture_on_commit_callbacks() as callbacks:
+        with django_assert_max_num_queries(5):
+            post.delete()
+    (bump,) = callbacks
+    assert isinstance(bump, PendingBump)
+    assert scopes <= bump.scopes
+
+
+def test_comment_save_bumps_post_scopes(
+    post, author, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        Comment.objects.create(post=post, author=author, text='Текст')
+        Comment.objects.create(post=post, author=author, text='Ещё текст')
+    (bump,) = callbacks
+    assert bump.scopes == {
+        f'post:{post.pk}', FEED_SCOPE, category_feed_scope(post.category.slug)
+    }
+
+
+def test_signup_does_not_bump(
+    django_user_model, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        django_user_model.objects.create_user('new', password='new')
+    assert callbacks == []
+
+
+def test_hidden_user_fields_do_not_bump(
+    author, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        author.set_password('other')
+        author.email = 'author@example.com'
+        author.save()
+    assert callbacks == []
+
+
+def test_visible_user_field_bumps(
+    author, django_user_model, django_capture_on_commit_callbacks
+):
+    author = django_user_model.objects.get(pk=author.pk)
+    with django_capture_on_commit_callbacks() as callbacks:
+        author.first_name = 'Имя'
+        author.save()
+    (bump,) = callbacks
+    assert bump.scopes == {f'user:{author.pk}', PAGES_SCOPE}
+
+
+def comments_count(post):
+    return Post.objects.values_list('comments_count', flat=True).get(
+        pk=post.pk
+    )
+
+
+def test_comments_count_follows_comments(post, author):
+    first = Comment.objects.create(post=post, author=author, text='Текст')
+    Comment.objects.create(post=post, author=author, text='Ещё текст')
+    assert comments_count(post) == 2
+    first.text = 'Исправленный текст'
+    first.save()
+    assert comments_count(post) == 2
+    first.delete()
+    assert comments_count(post) == 1
+
+
+def test_comments_count_after_views(transactional_db, post, author_client):
+    add_url = reverse('blog:add_comment', kwargs={'post_id': post.pk})
+    author_client.post(add_url, {'text': 'Первый'})
+    author_client.post(add_url, {'text': 'Второй'})
+    assert comments_count(post) == 2
+    comment = Comment.objects.filter(post=post).first()
+    author_client.post(reverse('blog:delete_comment', kwargs={
+        'post_id': post.pk, 'comment_id': comment.pk
+    }))
+    assert comments_count(post) == 1
+    assert Comment.objects.filter(post=post).count() == 1
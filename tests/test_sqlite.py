@@ -0,0 +1,12 @@
+import pytest
+
+from blogicum.sqlite.stress import run_stress
+
+
+@pytest.mark.django_db
+def test_tuned_backend_has_no_lock_errors(tmp_path):
+    result = run_stress(
+        'tuned', tmp_path / 'tuned.sqlite3', readers=4, writers=4, seconds=1
+    )
+    assert result['errors'] == 0
+    assert result['writes'] > 0 and result['reads'] > 0
@@ -0,0 +1,150 @@
+import os
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import HttpResponse
+
+from blogicum import staticfiles
+from blogicum.staticfiles import (
+    IMMUTABLE_MAX_AGE, MUTABLE_MAX_AGE, StaticFilesMiddleware
+)
+
+CSS = b'body { margin: 0; }\n' * 200
+# Brotli может быть не установлен: копию .br middleware берёт с диска.
+BROTLI_CSS = b'brotli'
+
+
+@pytest.fixture
+def static_root(tmp_path, settings):
+    source = tmp_path / 'static'
+    (source / 'css').mkdir(parents=True)
+    (source / 'css' / 'site.css').write_bytes(CSS)
+    (source / 'logo.png').write_bytes(os.urandom(256))
+    (source / 'tiny.txt').write_bytes(b'a')
+    settings.STATICFILES_DIRS = [source]
+    settings.STATICFILES_FINDERS = [
+        'django.contrib.staticfiles.finders.FileSystemFinder'
+    ]
+    settings.STATIC_ROOT = tmp_path / 'collected'
+    settings.DEBUG = False
+    call_command('collectstatic', interactive=False, verbosity=0)
+    css = settings.STATIC_ROOT / staticfiles_storage.stored_name(
+        'css/site.css'
+    )
+    (css.parent / (css.name + '.br')).write_bytes(BROTLI_CSS)
+    return settings.STATIC_ROOT
+
+
+@pytest.fixture
+def middleware(static_root):
+    return StaticFilesMiddleware(lambda request: HttpResponse('приложение'))
+
+
+@pytest.fixture
+def css_url(static_root):
+    return staticfiles_storage.url('css/site.css')
+
+
+def test_collectstatic_keeps_useful_copies(static_root, css_url):
+    names = {
+        os.path.relpath(os.path.join(directory, name), static_root)
+        for directory, _, files in os.walk(static_root) for name in files
+    }
+    assert 'css/site.css.gz' in names
+    assert css_url.removeprefix('/static/') + '.gz' in names
+    assert not any(
+        name.startswith(('logo', 'tiny')) and name.endswith('.gz')
+        for name in names
+    )
+
+
+@pytest.mark.parametrize('accept_encoding, encoding', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip, deflate', 'gzip'),
+    ('GZIP', 'gzip'),
+    ('br;q=0, gzip;q=0.5', 'gzip'),
+    ('br;q=0, gzip;q=0', None),
+    ('identity', None),
+    ('', None),
+])
+def test_encoding_negotiation(
+    rf, middleware, static_root, css_url, accept_encoding, encoding
+):
+    request = rf.get(css_url, HTTP_ACCEPT_ENCODING=accept_encoding)
+    response = middleware(request)
+    assert response.status_code == 200
+    assert response.get('Content-Encoding') == encoding
+    assert response['Vary'] == 'Accept-Encoding'
+    assert response['Content-Type'] == 'text/css'
+    path = static_root / css_url.removeprefix('/static/')
+    extension = {'br': '.br', 'gzip': '.gz', None: ''}[encoding]
+    expected = path.with_name(path.name + extension).read_bytes()
+    assert response.content == expected
+    assert int(response['Content-Length']) == len(expected)
+
+
+def test_etag_per_encoding(rf, middleware, css_url):
+    gzip = middleware(rf.get(css_url, HTTP_ACCEPT_ENCODING='gzip'))
+    identity = middleware(rf.get(css_url))
+    assert gzip['ETag'] != identity['ETag']
+    response = middleware(rf.get(
+        css_url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=gzip['ETag']
+    ))
+    assert response.status_code == 304
+    assert response['Vary'] == 'Accept-Encoding'
+    response = middleware(rf.get(css_url, HTTP_IF_NONE_MATCH=gzip['ETag']))
+    assert response.status_code == 200
+
+
+def test_hashed_name_is_immutable(rf, middleware, css_url):
+    response = middleware(rf.get(css_url))
+    assert response['Cache-Control'] == (
+        f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    )
+    response = middleware(rf.get('/static/css/site.css'))
+    assert response.status_code == 200
+    assert response['Cache-Control'] == f'public, max-age={MUTABLE_MAX_AGE}'
+
+
+@pytest.mark.parametrize('name', ['logo.png', 'tiny.txt'])
+def test_no_compressed_variant(rf, middleware, static_root, name):
+    url = staticfiles_storage.url(name)
+    response = middleware(rf.get(url, HTTP_ACCEPT_ENCODING='gzip, br'))
+    assert response.status_code == 200
+    assert not response.has_header('Content-Encoding')
+    assert not response.has_header('Vary')
+    assert response.content == (static_root / name).read_bytes()
+
+
+def test_large_file_read_from_disk(rf, static_root, css_url, monkeypatch):
+    monkeypatch.setattr(staticfiles, 'MAX_MEMORY_FILE_SIZE', 10)
+    middleware = StaticFilesMiddleware(lambda request: HttpResponse())
+    response = middleware(rf.get(css_url, HTTP_ACCEPT_ENCODING='gzip'))
+    assert response.streaming
+    assert not response.has_header('Content-Encoding')
+    assert response['Cache-Control'].endswith('immutable')
+    assert b''.join(response.streaming_content) == CSS
+
+
+def test_head_has_no_body(rf, middleware, css_url):
+    response = middleware(rf.head(css_url))
+    assert response.content == b''
+    assert int(response['Content-Length']) == len(CSS)
+
+
+@pytest.mark.parametrize('method, path', [
+    ('get', '/static/missing.css'),
+    ('get', '/'),
+    ('post', '/static/tiny.txt'),
+])
+def test_other_requests_reach_app(rf, middleware, method, path):
+    response = middleware(getattr(rf, method)(path))
+    assert response.content.decode() == 'приложение'
+
+
+def test_not_used_in_debug(static_root, settings):
+    settings.DEBUG = True
+    with pytest.raises(MiddlewareNotUsed):
+        StaticFilesMiddleware(lambda request: HttpResponse())
@@ -0,0 +1,28 @@
+from django.core.management import call_command
+from django.urls import reverse
+
+from blog.models import Post
+from blog.text import EXCERPT_WORDS
+
+HTML = 'Текст поста<br>из &lt;фикстуры&gt;'
+
+
+def test_save_renders_text(post):
+    post.text = ' '.join(['слово'] * (EXCERPT_WORDS + 5)) + '\n<b>'
+    post.save(update_fields=['text'])
+    post = Post.objects.get(pk=post.pk)
+    assert post.excerpt == ' '.join(['слово'] * EXCERPT_WORDS) + ' …'
+    assert post.text_html.endswith('<br>&lt;b&gt;')
+
+
+def test_loaddata_renders_text(posts_fixture):
+    call_command('loaddata', posts_fixture, verbosity=0)
+    post = Post.objects.get(pk=1)
+    assert post.text_html == HTML
+    assert post.excerpt == 'Текст поста из <фикстуры>'
+
+
+def test_detail_page_shows_fixture_text(client, posts_fixture, lookups):
+    call_command('loaddata', posts_fixture, verbosity=0)
+    response = client.get(reverse('blog:post_detail', args=(1,)))
+    assert HTML in response.content.decode()